@@ -330,10 +330,23 @@ def _refresh_ip_regions_cli(cache_directory: str | None = None, use_encryption:
     type=rich_click.BOOL,
     default=True,
 )
-def _update_ip_coordinates_cli(cache_directory: str | None = None, use_encryption: bool = True) -> None:
+@rich_click.option(
+    "--workers",
+    help=(
+        "The number of geocoding requests to keep in flight at once. "
+        "By default, requests are sent one at a time to respect the rate limit of the free OpenCage plan."
+    ),
+    required=False,
+    type=rich_click.IntRange(min=1),
+    default=1,
+)
+def _update_ip_coordinates_cli(
+    cache_directory: str | None = None, use_encryption: bool = True, workers: int = 1
+) -> None:
     update_region_code_coordinates(
         cache_directory=pathlib.Path(cache_directory) if cache_directory is not None else None,
         use_encryption=use_encryption,
+        workers=workers,
     )
 
 
@@ -490,29 +503,37 @@ def _generate_benchmark_cli(directory: str) -> None:
     ),
 )
 @rich_click.argument("directory", type=rich_click.Path(writable=False))
+@rich_click.option(
+    "--workers",
+    help=(
+        "The maximum number of workers to use for parallel processing. "
+        "Allows negative slicing semantics, where -1 means all available cores, -2 means all but one, etc. "
+        "By default, all but one core is used."
+    ),
+    required=False,
+    type=rich_click.IntRange(min=-os.cpu_count() + 1, max=os.cpu_count()),
+    default=-2,
+)
 def _validate_cli(
     protocol: typing.Literal[
         "downloads_logic", "http_empty_split", "http_split_count", "extraction_heuristic", "timestamps_parsing"
     ],
     directory: pathlib.Path,
+    workers: int = -2,
 ) -> None:
     """Run a pre-validation protocol."""
     match protocol:
         case "downloads_logic":
             validator = DownloadsLogicPreValidator()
-            validator.validate_directory(directory=directory)
         case "http_empty_split":
             validator = HttpEmptySplitPreValidator()
-            validator.validate_directory(directory=directory)
         case "http_split_count":
             validator = HttpSplitCountPreValidator()
-            validator.validate_directory(directory=directory)
         case "extraction_heuristic":
             validator = ExtractionHeuristicPreValidator()
-            validator.validate_directory(directory=directory)
         case "timestamps_parsing":
             validator = TimestampsParsingPreValidator()
-            validator.validate_directory(directory=directory)
+    validator.validate_directory(directory=directory, workers=workers)
 
 
 # s3logextraction stats --inventory <path> [--cache <path>]
@@ -1,4 +1,6 @@
+import functools
 import json
+import os
 import pathlib
 import typing
 
@@ -15,27 +17,52 @@ def save_config(config: dict[str, typing.Any]) -> None:
         The configuration for S3 log extraction.
     """
     # TODO: add basic schema and validation
-    if not any(config):
+    if not config:
         return
 
-    with open(file=S3_LOG_EXTRACTION_CONFIG_FILE_PATH, mode="w") as file_stream:
-        json.dump(obj=config, fp=file_stream, indent=2, sort_keys=True)
+    _write_config(config=config)
+    _load_config.cache_clear()
 
 
 def get_config() -> dict[str, typing.Any]:
     """
     Get the configuration for S3 log extraction.
 
+    The file is only parsed again once it has changed on disk. Otherwise a cached copy is used.
+
     Returns
     -------
     dict
         The configuration for S3 log extraction.
     """
-    config = {}
-    if not S3_LOG_EXTRACTION_CONFIG_FILE_PATH.exists():
-        with open(file=S3_LOG_EXTRACTION_CONFIG_FILE_PATH, mode="w") as file_stream:
+    try:
+        file_stat = S3_LOG_EXTRACTION_CONFIG_FILE_PATH.stat()
+    except FileNotFoundError:
+        _write_config(config={})
+        file_stat = S3_LOG_EXTRACTION_CONFIG_FILE_PATH.stat()
+
+    # Hand out a copy so that callers mutating their result cannot alter the cached configuration
+    config = dict(_load_config(modification_time=file_stat.st_mtime_ns, file_size=file_stat.st_size))
+    return config
+
+
+def _write_config(*, config: dict[str, typing.Any]) -> None:
+    # Write to a sibling file and swap it into place, so that other processes only ever read a complete configuration
+    temporary_file_path = S3_LOG_EXTRACTION_CONFIG_FILE_PATH.with_name(
+        f"{S3_LOG_EXTRACTION_CONFIG_FILE_PATH.name}.tmp.{os.getpid()}"
+    )
+    try:
+        with open(file=temporary_file_path, mode="w") as file_stream:
             json.dump(obj=config, fp=file_stream, indent=2, sort_keys=True)
+        os.replace(src=temporary_file_path, dst=S3_LOG_EXTRACTION_CONFIG_FILE_PATH)
+    finally:
+        temporary_file_path.unlink(missing_ok=True)
+
 
+@functools.lru_cache(maxsize=1)
+def _load_config(*, modification_time: int, file_size: int) -> dict[str, typing.Any]:
+    # The arguments are only the cache key: a change to either means the file was rewritten since it was last read
+    # (the size guards against two writes landing within the resolution of the file system timestamps)
     with open(file=S3_LOG_EXTRACTION_CONFIG_FILE_PATH, mode="r") as file_stream:
         config = json.load(fp=file_stream)
 
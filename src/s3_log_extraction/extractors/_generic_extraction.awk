@@ -22,7 +22,8 @@ BEGIN {
 }
 
 {
-    if (NF == 0) {next}
+    # A cheap substring test discards most non-GET (and empty) lines before any fields are split
+    if (!index($0, "REST.GET.OBJECT")) {next}
 
     # Pre-URI fields like this should be unaffected
     split($1, pre_uri_fields, " ")
@@ -48,36 +49,62 @@ BEGIN {
     ip = pre_uri_fields[5]
     download = (status == "200" ? 1 : 0)
 
-    data[object_key]["timestamps"][++data[object_key]["timestamps_count"]] = parsed_timestamp
-    data[object_key]["bytes_sent"][++data[object_key]["bytes_sent_count"]] = bytes_sent
-    data[object_key]["ip"][++data[object_key]["ip_count"]] = ip
-    data[object_key]["download"][++data[object_key]["download_count"]] = download
+    # All four columns share a single row counter per object key
+    row = ++row_counts[object_key]
+    timestamps[object_key, row] = parsed_timestamp
+    bytes_sent_values[object_key, row] = bytes_sent
+    ips[object_key, row] = ip
+    downloads[object_key, row] = download
 }
 
 END {
-    for (object_key in data) {
+    # Spawning one shell per object key dominated the runtime of logs touching many keys, so the directories are
+    # created in batches. The length cap keeps each command comfortably below the system argument limit.
+    quoted_subdirectories = ""
+    for (object_key in row_counts) {
         subdirectory = EXTRACTION_DIRECTORY object_key
-        system("mkdir -p " subdirectory)
+
+        # Single-quote the path for the shell so that spaces or metacharacters in the cache directory or object key
+        # cannot break the command
+        gsub(/'/, "'\"'\"'", subdirectory)
+        quoted_subdirectories = quoted_subdirectories " '" subdirectory "'"
+        if (length(quoted_subdirectories) > 65536) {
+            create_directories(quoted_subdirectories)
+            quoted_subdirectories = ""
+        }
+    }
+    if (quoted_subdirectories != "") {
+        create_directories(quoted_subdirectories)
     }
 
-    for (object_key in data) {
+    for (object_key in row_counts) {
         subdirectory = EXTRACTION_DIRECTORY object_key
         timestamps_file_path = subdirectory "/timestamps.txt"
         bytes_sent_file_path = subdirectory "/bytes_sent.txt"
         full_ips_file_path = subdirectory "/ips.txt"
         download_file_path = subdirectory "/download.txt"
 
-        for (i = 1; i <= data[object_key]["timestamps_count"]; i++) {
-            print data[object_key]["timestamps"][i] >> timestamps_file_path
-        }
-        for (i = 1; i <= data[object_key]["bytes_sent_count"]; i++) {
-            print data[object_key]["bytes_sent"][i] >> bytes_sent_file_path
-        }
-        for (i = 1; i <= data[object_key]["ip_count"]; i++) {
-            print data[object_key]["ip"][i] >> full_ips_file_path
-        }
-        for (i = 1; i <= data[object_key]["download_count"]; i++) {
-            print data[object_key]["download"][i] >> download_file_path
+        number_of_rows = row_counts[object_key]
+        for (i = 1; i <= number_of_rows; i++) {
+            print timestamps[object_key, i] >> timestamps_file_path
+            print bytes_sent_values[object_key, i] >> bytes_sent_file_path
+            print ips[object_key, i] >> full_ips_file_path
+            print downloads[object_key, i] >> download_file_path
         }
+
+        # Flush and release the handles now. Otherwise every output file stays open until exit, and logs with
+        # many object keys exhaust the descriptor limit, forcing awk to repeatedly close and reopen files.
+        close(timestamps_file_path)
+        close(bytes_sent_file_path)
+        close(full_ips_file_path)
+        close(download_file_path)
+    }
+}
+
+# A failure here would leave the log file recorded as started but never finished
+function create_directories(quoted_subdirectories) {
+    if (system("mkdir -p" quoted_subdirectories) != 0) {
+        print "Failed to create the directories for the extracted object keys" > "/dev/stderr"
+        exit 1
     }
 }
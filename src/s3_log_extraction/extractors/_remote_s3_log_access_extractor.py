@@ -12,10 +12,19 @@ import warnings
 import tqdm
 
 from ._globals import _STOP_EXTRACTION_FILE_NAME
-from ._utils import _deploy_subprocess, _handle_aws_credentials, _merge_dir_to_extraction, _merge_file_into_extraction
+from ._utils import (
+    _deploy_subprocess,
+    _handle_aws_credentials,
+    _load_processing_end_record,
+    _merge_dir_to_extraction,
+    _merge_files_into_extraction,
+)
 from ..config import get_cache_directory, get_cache_subdirectory
 from ..utils import _handle_max_workers, _read_s3_urls_from_local_inventory
 
+# Large enough that remote reads stay efficient, small enough that the peak memory per worker remains modest
+_DOWNLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+
 
 class RemoteS3LogAccessExtractor:
     """
@@ -55,6 +64,7 @@ class RemoteS3LogAccessExtractor:
 
         # TODO: does this hold after bundling?
         self._relative_script_path = pathlib.Path(__file__).parent / "_generic_extraction.awk"
+        self._absolute_script_path = str(self._relative_script_path.absolute())
         self._awk_env = {"EXTRACTION_DIRECTORY": str(self.extraction_directory)}
 
     def extract_s3_bucket(
@@ -109,20 +119,54 @@ class RemoteS3LogAccessExtractor:
         unprocessed_s3_urls = self._get_unprocessed_s3_urls(s3_root=s3_root, inventory_directory=inventory_directory)
         s3_urls_to_extract = unprocessed_s3_urls[:limit] if limit is not None else unprocessed_s3_urls
 
+        # No point in spawning more worker processes than there are files to extract
+        max_workers = min(max_workers, max(len(s3_urls_to_extract), 1))
+
         tqdm_style_kwargs = {
             "desc": "Running extraction on remote S3 logs",
             "unit": "files",
             "smoothing": 0,
         }
         if max_workers == 1:
-            for s3_url in tqdm.tqdm(
-                iterable=s3_urls_to_extract, total=len(s3_urls_to_extract), leave=True, **tqdm_style_kwargs
-            ):
-                self._extract_s3_url(s3_url=s3_url, s3_root=s3_root)
+            # Downloading is network-bound while extraction is CPU-bound, so the next log is fetched in a background
+            # thread while the current one is being extracted. Only one log is ever fetched ahead.
+            with concurrent.futures.ThreadPoolExecutor(max_workers=1) as download_executor:
+                next_download = None
+                if len(s3_urls_to_extract) > 0:
+                    next_download = download_executor.submit(self._download_s3_url, s3_url=s3_urls_to_extract[0])
+
+                try:
+                    for index, s3_url in enumerate(
+                        tqdm.tqdm(
+                            iterable=s3_urls_to_extract, total=len(s3_urls_to_extract), leave=True, **tqdm_style_kwargs
+                        )
+                    ):
+                        if self.stop_file_path.exists():
+                            break
+
+                        temporary_file_path = next_download.result()
+                        next_download = None
+                        if index + 1 < len(s3_urls_to_extract):
+                            next_download = download_executor.submit(
+                                self._download_s3_url, s3_url=s3_urls_to_extract[index + 1]
+                            )
+
+                        self._extract_s3_url(s3_url=s3_url, s3_root=s3_root, temporary_file_path=temporary_file_path)
+                finally:
+                    # A log fetched ahead is not extracted after a stop or an error.
+                    # Let its download settle so that it is removed along with the rest of the temporary directory.
+                    if next_download is not None:
+                        next_download.cancel()
+                        concurrent.futures.wait(fs=[next_download])
+                    shutil.rmtree(path=self.temporary_directory, ignore_errors=True)
         else:
             batches = itertools.batched(iterable=s3_urls_to_extract, n=batch_size)
             number_of_batches = math.ceil(len(s3_urls_to_extract) / batch_size)
-            with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+            # Mirror directories persist across batches, so remember which ones already exist in this run
+            created_directories: set[pathlib.Path] = set()
+            with concurrent.futures.ProcessPoolExecutor(
+                max_workers=max_workers, initializer=_initialize_worker, initargs=(self,)
+            ) as executor:
                 for batch in tqdm.tqdm(
                     iterable=batches,
                     total=number_of_batches,
@@ -138,14 +182,7 @@ class RemoteS3LogAccessExtractor:
 
                     tqdm_style_kwargs["total"] = len(batch)
                     futures = [
-                        executor.submit(
-                            self._extract_s3_url,
-                            s3_url=s3_url,
-                            enable_stop=False,
-                            parallel_mode=True,
-                            s3_root=s3_root,
-                        )
-                        for s3_url in batch
+                        executor.submit(_extract_s3_url_in_worker, s3_url=s3_url, s3_root=s3_root) for s3_url in batch
                     ]
                     collections.deque(
                         (
@@ -160,28 +197,36 @@ class RemoteS3LogAccessExtractor:
                         maxlen=0,
                     )
 
-                    files_to_copy = [
-                        path for path in self.temporary_directory.rglob(pattern="*.txt") if path.is_file() is True
-                    ]
-                    for file_path in tqdm.tqdm(
-                        iterable=files_to_copy,
-                        total=len(files_to_copy),
+                    # Child processes each leave their own copy of an object's files.
+                    # These are gathered per destination so that every destination is opened only once per batch.
+                    source_file_paths_by_destination = collections.defaultdict(list)
+                    for file_path in self.temporary_directory.rglob(pattern="*.txt"):
+                        if file_path.is_file() is False:
+                            continue
+
+                        relative_parts = file_path.relative_to(self.temporary_directory).parts[1:]
+                        destination_file_path = self.extraction_directory / pathlib.Path(*relative_parts)
+                        source_file_paths_by_destination[destination_file_path].append(file_path)
+
+                    for destination_file_path, source_file_paths in tqdm.tqdm(
+                        iterable=source_file_paths_by_destination.items(),
+                        total=len(source_file_paths_by_destination),
                         desc="Copying files from child processes",
                         unit="files",
                         smoothing=0,
                         position=1,
                         leave=False,
                     ):
-                        relative_parts = file_path.relative_to(self.temporary_directory).parts[1:]
-                        relative_file_path = pathlib.Path(*relative_parts)
-                        destination_file_path = self.extraction_directory / relative_file_path
-                        destination_file_path.parent.mkdir(parents=True, exist_ok=True)
-                        _merge_file_into_extraction(
-                            source_file_path=file_path,
+                        if destination_file_path.parent not in created_directories:
+                            destination_file_path.parent.mkdir(parents=True, exist_ok=True)
+                            created_directories.add(destination_file_path.parent)
+                        _merge_files_into_extraction(
+                            source_file_paths=source_file_paths,
                             destination_file_path=destination_file_path,
                             use_encryption=self.use_encryption,
                         )
-                        file_path.unlink()
+                        for source_file_path in source_file_paths:
+                            source_file_path.unlink()
                     shutil.rmtree(path=self.temporary_directory)
                     self.temporary_directory.mkdir()
 
@@ -209,27 +254,10 @@ class RemoteS3LogAccessExtractor:
         return unprocessed_s3_urls
 
     def _get_end_record_and_check_consistency(self) -> None:
-        self.s3_url_processing_end_record: set[str] = set()
-        s3_url_processing_record_difference: set[str] = set()
-        if (
-            self.s3_url_processing_start_record_file_path.exists()
-            and self.s3_url_processing_end_record_file_path.exists()
-        ):
-            s3_url_processing_start_record = {
-                file_path for file_path in self.s3_url_processing_start_record_file_path.read_text().splitlines()
-            }
-            self.s3_url_processing_end_record = {
-                file_path for file_path in self.s3_url_processing_end_record_file_path.read_text().splitlines()
-            }
-            s3_url_processing_record_difference = s3_url_processing_start_record - self.s3_url_processing_end_record
-        if len(s3_url_processing_record_difference) > 0:
-            # IDEA: an advanced feature for the future could be looking at the timestamp of the 'started' log
-            # and cleaning the entire extraction directory of entries with that date (and possibly +/- a day around it)
-            message = (
-                "\nRecord corruption from previous run detected - "
-                "please call `s3logextraction reset extraction` to clean the extraction cache and records.\n\n"
-            )
-            raise ValueError(message)
+        self.s3_url_processing_end_record = _load_processing_end_record(
+            start_record_file_path=self.s3_url_processing_start_record_file_path,
+            end_record_file_path=self.s3_url_processing_end_record_file_path,
+        )
 
     def _get_unprocessed_s3_urls_from_local_inventory(
         self, inventory_directory: pathlib.Path, s3_root: str
@@ -284,7 +312,8 @@ class RemoteS3LogAccessExtractor:
             stacklevel=3,
         )
         years_result = _deploy_subprocess(
-            command=f"s5cmd ls {s3_root}/", error_message=f"Failed to scan years of nested structure at {s3_root}."
+            command=["s5cmd", "ls", f"{s3_root}/"],
+            error_message=f"Failed to scan years of nested structure at {s3_root}.",
         )
         years = {line.split(" ")[-1].rstrip("/\n") for line in years_result.splitlines()}
 
@@ -292,7 +321,8 @@ class RemoteS3LogAccessExtractor:
         for year in years:
             subdirectory = f"{s3_root}/{year}"
             months_result = _deploy_subprocess(
-                command=f"s5cmd ls {subdirectory}/", error_message=f"Failed to list structure of {subdirectory}/."
+                command=["s5cmd", "ls", f"{subdirectory}/"],
+                error_message=f"Failed to list structure of {subdirectory}/.",
             )
             if months_result is None:
                 continue
@@ -302,7 +332,8 @@ class RemoteS3LogAccessExtractor:
             for month in months:
                 subdirectory = f"{s3_root}/{year}/{month}"
                 days_result = _deploy_subprocess(
-                    command=f"s5cmd ls {subdirectory}/", error_message=f"Failed to list structure of {subdirectory}/."
+                    command=["s5cmd", "ls", f"{subdirectory}/"],
+                    error_message=f"Failed to list structure of {subdirectory}/.",
                 )
                 if days_result is None:
                     continue
@@ -326,7 +357,8 @@ class RemoteS3LogAccessExtractor:
             year, month, day = date.split("-")
             subdirectory = f"{s3_root}/{year}/{month}/{day}"
             s3_urls_result = _deploy_subprocess(
-                command=f"s5cmd ls {subdirectory}/", error_message=f"Failed to list structure of {subdirectory}/."
+                command=["s5cmd", "ls", f"{subdirectory}/"],
+                error_message=f"Failed to list structure of {subdirectory}/.",
             )
             if s3_urls_result is None:
                 continue
@@ -343,9 +375,8 @@ class RemoteS3LogAccessExtractor:
         enable_stop: bool = True,
         parallel_mode: bool = False,
         s3_root: str | None = None,
+        temporary_file_path: pathlib.Path | None = None,
     ) -> None:
-        import fsspec
-
         if enable_stop is True and self.stop_file_path.exists():
             return
 
@@ -355,8 +386,10 @@ class RemoteS3LogAccessExtractor:
             extraction_directory = self.temporary_directory / str(os.getpid())
             extraction_directory.mkdir(exist_ok=True)
         elif self.use_encryption:
-            # For single-worker mode with encryption: use a per-call temp dir so we can use_encryption on merge
-            extraction_directory = pathlib.Path(tempfile.mkdtemp(prefix="s3logextraction-"))
+            # For single-worker mode with encryption: stage into a scratch directory so IPs can be encrypted on merge
+            # The same scratch directory is reused (and emptied after each merge) rather than creating one per file
+            extraction_directory = self.temporary_directory / "serial"
+            extraction_directory.mkdir(parents=True, exist_ok=True)
 
         record_key = s3_url.split("/")[-1]
 
@@ -364,9 +397,8 @@ class RemoteS3LogAccessExtractor:
         with self.s3_url_processing_start_record_file_path.open(mode="a") as file_stream:
             file_stream.write(f"{record_key}\n")
 
-        temporary_file_path = self.temporary_directory / s3_url.split("/")[-1]
-        with fsspec.open(urlpath=s3_url, mode="rb") as file_stream:
-            temporary_file_path.write_bytes(data=file_stream.read())
+        if temporary_file_path is None:
+            temporary_file_path = self._download_s3_url(s3_url=s3_url)
 
         self._run_extraction(file_path=temporary_file_path, extraction_directory=extraction_directory)
 
@@ -383,16 +415,44 @@ class RemoteS3LogAccessExtractor:
             file_stream.write(f"{record_key}\n")
         temporary_file_path.unlink()
 
+    def _download_s3_url(self, *, s3_url: str) -> pathlib.Path:
+        """Download a single remote log file into the temporary directory and return its local path."""
+        import fsspec
+
+        temporary_file_path = self.temporary_directory / s3_url.split("/")[-1]
+        # Copy in chunks rather than holding the whole (potentially very large) log in memory at once
+        with fsspec.open(urlpath=s3_url, mode="rb") as file_stream, temporary_file_path.open(mode="wb") as copy_stream:
+            shutil.copyfileobj(fsrc=file_stream, fdst=copy_stream, length=_DOWNLOAD_CHUNK_SIZE)
+
+        return temporary_file_path
+
     def _run_extraction(self, *, file_path: pathlib.Path, extraction_directory: pathlib.Path | None = None) -> None:
+        # Override the target on a copy. Writing it back to the instance would silently redirect every later call
+        # made without an explicit directory into whichever staging directory was used last.
+        awk_env = dict(self._awk_env)
         if extraction_directory is not None:
-            self._awk_env["EXTRACTION_DIRECTORY"] = str(extraction_directory)
+            awk_env["EXTRACTION_DIRECTORY"] = str(extraction_directory)
 
-        absolute_script_path = str(self._relative_script_path.absolute())
         absolute_file_path = str(file_path.absolute())
 
-        gawk_command = f"gawk --file {absolute_script_path} {absolute_file_path}"
+        gawk_command = ["gawk", "--file", self._absolute_script_path, absolute_file_path]
         _deploy_subprocess(
             command=gawk_command,
-            environment_variables=self._awk_env,
+            environment_variables=awk_env,
             error_message=f"Extraction failed on {file_path}.",
+            capture_stdout=False,
         )
+
+
+# Each worker process receives its own copy of the extractor once, when the pool starts, instead of having the
+# extractor (including its potentially very large processing record) pickled along with every submitted URL
+_worker_extractor: RemoteS3LogAccessExtractor | None = None
+
+
+def _initialize_worker(extractor: RemoteS3LogAccessExtractor) -> None:
+    global _worker_extractor
+    _worker_extractor = extractor
+
+
+def _extract_s3_url_in_worker(*, s3_url: str, s3_root: str) -> None:
+    _worker_extractor._extract_s3_url(s3_url=s3_url, enable_stop=False, parallel_mode=True, s3_root=s3_root)
@@ -8,13 +8,21 @@ import random
 import shutil
 import tempfile
 
-import natsort
 import tqdm
 
 from ._globals import _STOP_EXTRACTION_FILE_NAME
-from ._utils import _deploy_subprocess, _merge_dir_to_extraction, _merge_file_into_extraction
+from ._utils import (
+    _deploy_subprocess,
+    _load_processing_end_record,
+    _merge_dir_to_extraction,
+    _merge_files_into_extraction,
+)
 from ..config import get_cache_directory, get_cache_subdirectory
 from ..utils import _handle_max_workers
+from ..utils.walk import _walk_file_paths
+
+# The number of chunks each worker process receives per batch of files to extract
+_CHUNKS_PER_WORKER = 32
 
 
 class S3LogAccessExtractor:
@@ -51,26 +59,13 @@ class S3LogAccessExtractor:
 
         # TODO: does this hold after bundling?
         self._relative_script_path = pathlib.Path(__file__).parent / "_generic_extraction.awk"
+        self._absolute_script_path = str(self._relative_script_path.absolute())
         self._awk_env = {"EXTRACTION_DIRECTORY": str(self.extraction_directory)}
 
-        self.file_processing_end_record: set[str] = set()
-        file_processing_record_difference: set[str] = set()
-        if self.file_processing_start_record_file_path.exists() and self.file_processing_end_record_file_path.exists():
-            file_processing_start_record = {
-                file_path for file_path in self.file_processing_start_record_file_path.read_text().splitlines()
-            }
-            self.file_processing_end_record = {
-                file_path for file_path in self.file_processing_end_record_file_path.read_text().splitlines()
-            }
-            file_processing_record_difference = file_processing_start_record - self.file_processing_end_record
-        if len(file_processing_record_difference) > 0:
-            # IDEA: an advanced feature for the future could be looking at the timestamp of the 'started' log
-            # and cleaning the entire extraction directory of entries with that date (and possibly +/- a day around it)
-            message = (
-                "\nRecord corruption from previous run detected - "
-                "please call `s3logextraction reset extraction` to clean the extraction cache and records.\n\n"
-            )
-            raise ValueError(message)
+        self.file_processing_end_record = _load_processing_end_record(
+            start_record_file_path=self.file_processing_start_record_file_path,
+            end_record_file_path=self.file_processing_end_record_file_path,
+        )
 
     def extract_directory(
         self,
@@ -83,17 +78,20 @@ class S3LogAccessExtractor:
         directory = pathlib.Path(directory)
         max_workers = _handle_max_workers(workers=workers)
 
-        all_relative_log_paths = {
-            str(file_path.relative_to(directory))
-            for file_path in natsort.natsorted(seq=directory.rglob(pattern="*-*-*-*-*-*-*"))
-        }
-        unextracted_relative_paths = list(all_relative_log_paths - self.file_processing_end_record)
-        # Resolve back to absolute paths for the actual extraction
-        unextracted_files = [str((directory / rel_path).absolute()) for rel_path in unextracted_relative_paths]
-
-        files_to_extract = unextracted_files[:limit] if limit is not None else unextracted_files
+        # Filter against the record lazily so that enumeration can stop as soon as the limit is reached
+        # The walk yields absolute paths under the directory, so the record key is everything after that prefix
+        directory_prefix_length = len(os.path.join(directory.absolute(), ""))
+        unextracted_files = (
+            file_path
+            for file_path in _walk_file_paths(directory=directory, pattern="*-*-*-*-*-*-*")
+            if file_path[directory_prefix_length:] not in self.file_processing_end_record
+        )
+        files_to_extract = list(itertools.islice(unextracted_files, limit))
         random.shuffle(files_to_extract)
 
+        # No point in spawning more worker processes than there are files to extract
+        max_workers = min(max_workers, max(len(files_to_extract), 1))
+
         tqdm_style_kwargs = {
             "total": len(files_to_extract),
             "desc": "Running extraction on S3 logs",
@@ -106,11 +104,11 @@ class S3LogAccessExtractor:
         else:
             batches = itertools.batched(iterable=files_to_extract, n=batch_size)
             number_of_batches = math.ceil(len(files_to_extract) / batch_size)
-            with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
-                pid_specific_extraction_directory = pathlib.Path(tempfile.mkdtemp(prefix="s3logextraction-"))
-                pid_specific_extraction_directory.mkdir(exist_ok=True)
-                self._awk_env["EXTRACTION_DIRECTORY"] = str(pid_specific_extraction_directory)
-
+            # Mirror directories persist across batches, so remember which ones already exist in this run
+            created_directories: set[pathlib.Path] = set()
+            with concurrent.futures.ProcessPoolExecutor(
+                max_workers=max_workers, initializer=_initialize_worker, initargs=(self,)
+            ) as executor:
                 for batch in tqdm.tqdm(
                     iterable=batches,
                     total=number_of_batches,
@@ -123,50 +121,46 @@ class S3LogAccessExtractor:
                     if self.stop_file_path.exists():
                         return
 
+                    # Hand the files to the workers in chunks, so that the cost of each task round-trip is paid per
+                    # chunk rather than per file, while leaving several chunks per worker to keep the load balanced
+                    chunk_size = max(len(batch) // (max_workers * _CHUNKS_PER_WORKER), 1)
+                    future_to_chunk = {
+                        executor.submit(_extract_files_in_worker, file_paths=chunk, log_root=directory): chunk
+                        for chunk in itertools.batched(iterable=batch, n=chunk_size)
+                    }
                     tqdm_style_kwargs["total"] = len(batch)
-                    futures = [
-                        executor.submit(
-                            self.extract_file,
-                            file_path=file_path,
-                            enable_stop=False,
-                            parallel_mode=True,
-                            log_root=directory,
-                        )
-                        for file_path in batch
-                    ]
-                    collections.deque(
-                        (
+                    with tqdm.tqdm(position=1, leave=False, **tqdm_style_kwargs) as progress_bar:
+                        for future in concurrent.futures.as_completed(future_to_chunk):
                             future.result()
-                            for future in tqdm.tqdm(
-                                iterable=concurrent.futures.as_completed(futures),
-                                position=1,
-                                leave=False,
-                                **tqdm_style_kwargs,
-                            )
-                        ),
-                        maxlen=0,
-                    )
-
-                    files_to_copy = list(self.temporary_directory.rglob(pattern="*.txt"))
-                    for file_path in tqdm.tqdm(
-                        iterable=files_to_copy,
-                        total=len(files_to_copy),
+                            progress_bar.update(len(future_to_chunk[future]))
+
+                    # Child processes each leave their own copy of an object's files.
+                    # These are gathered per destination so that every destination is opened only once per batch.
+                    source_file_paths_by_destination = collections.defaultdict(list)
+                    for file_path in self.temporary_directory.rglob(pattern="*.txt"):
+                        relative_parts = file_path.relative_to(self.temporary_directory).parts[1:]
+                        destination_file_path = self.extraction_directory / pathlib.Path(*relative_parts)
+                        source_file_paths_by_destination[destination_file_path].append(file_path)
+
+                    for destination_file_path, source_file_paths in tqdm.tqdm(
+                        iterable=source_file_paths_by_destination.items(),
+                        total=len(source_file_paths_by_destination),
                         desc="Copying files from child processes",
                         unit="files",
                         smoothing=0,
                         position=1,
                         leave=False,
                     ):
-                        relative_parts = file_path.relative_to(self.temporary_directory).parts[1:]
-                        relative_file_path = pathlib.Path(*relative_parts)
-                        destination_file_path = self.extraction_directory / relative_file_path
-                        destination_file_path.parent.mkdir(parents=True, exist_ok=True)
-                        _merge_file_into_extraction(
-                            source_file_path=file_path,
+                        if destination_file_path.parent not in created_directories:
+                            destination_file_path.parent.mkdir(parents=True, exist_ok=True)
+                            created_directories.add(destination_file_path.parent)
+                        _merge_files_into_extraction(
+                            source_file_paths=source_file_paths,
                             destination_file_path=destination_file_path,
                             use_encryption=self.use_encryption,
                         )
-                        file_path.unlink()
+                        for source_file_path in source_file_paths:
+                            source_file_path.unlink()
 
         shutil.rmtree(path=self.temporary_directory, ignore_errors=True)
 
@@ -186,8 +180,10 @@ class S3LogAccessExtractor:
             extraction_directory = self.temporary_directory / str(os.getpid())
             extraction_directory.mkdir(exist_ok=True)
         elif self.use_encryption:
-            # For single-worker mode with encryption: use a per-call temp dir so we can use_encryption on merge
-            extraction_directory = pathlib.Path(tempfile.mkdtemp(prefix="s3logextraction-"))
+            # For single-worker mode with encryption: stage into a scratch directory so IPs can be encrypted on merge
+            # The same scratch directory is reused (and emptied after each merge) rather than creating one per file
+            extraction_directory = self.temporary_directory / "serial"
+            extraction_directory.mkdir(parents=True, exist_ok=True)
 
         file_path = pathlib.Path(file_path)
         if log_root is not None:
@@ -218,15 +214,33 @@ class S3LogAccessExtractor:
             file_stream.write(content)
 
     def _run_extraction(self, *, file_path: pathlib.Path, extraction_directory: pathlib.Path | None = None) -> None:
+        # Override the target on a copy. Writing it back to the instance would silently redirect every later call
+        # made without an explicit directory into whichever staging directory was used last.
+        awk_env = dict(self._awk_env)
         if extraction_directory is not None:
-            self._awk_env["EXTRACTION_DIRECTORY"] = str(extraction_directory)
+            awk_env["EXTRACTION_DIRECTORY"] = str(extraction_directory)
 
-        absolute_script_path = str(self._relative_script_path.absolute())
         absolute_file_path = str(file_path.absolute())
 
-        gawk_command = f"gawk --file {absolute_script_path} {absolute_file_path}"
+        gawk_command = ["gawk", "--file", self._absolute_script_path, absolute_file_path]
         _deploy_subprocess(
             command=gawk_command,
-            environment_variables=self._awk_env,
+            environment_variables=awk_env,
             error_message=f"Extraction failed on {file_path}.",
+            capture_stdout=False,
         )
+
+
+# Each worker process receives its own copy of the extractor once, when the pool starts, instead of having the
+# extractor (including its potentially very large processing record) pickled along with every submitted file
+_worker_extractor: S3LogAccessExtractor | None = None
+
+
+def _initialize_worker(extractor: S3LogAccessExtractor) -> None:
+    global _worker_extractor
+    _worker_extractor = extractor
+
+
+def _extract_files_in_worker(*, file_paths: tuple[str, ...], log_root: pathlib.Path) -> None:
+    for file_path in file_paths:
+        _worker_extractor.extract_file(file_path=file_path, enable_stop=False, parallel_mode=True, log_root=log_root)
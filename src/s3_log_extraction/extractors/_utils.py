@@ -5,31 +5,76 @@ import subprocess
 from ..ip_utils._ip_utils import _read_ips_from_file, _write_ips_to_file
 
 
-def _merge_file_into_extraction(
+def _load_processing_end_record(
+    *, start_record_file_path: pathlib.Path, end_record_file_path: pathlib.Path
+) -> set[str]:
+    """
+    Load the record of finished files, after checking that every file recorded as started has also finished.
+
+    Parameters
+    ----------
+    start_record_file_path : pathlib.Path
+        The record file that a file is appended to before its processing begins.
+    end_record_file_path : pathlib.Path
+        The record file that a file is appended to once its processing has succeeded.
+
+    Returns
+    -------
+    set of str
+        The entries of the end record, or an empty set if either record does not exist yet.
+
+    Raises
+    ------
+    ValueError
+        If any file was started but never finished, which means an earlier run was interrupted part-way through it.
+    """
+    if not (start_record_file_path.exists() and end_record_file_path.exists()):
+        return set()
+
+    # Stream the records line by line so that neither file is also held in memory as one string and a list
+    with end_record_file_path.open(mode="r") as file_stream:
+        end_record = {line.rstrip("\n") for line in file_stream}
+
+    # Only the end record needs to be kept. The start record is checked against it entry by entry.
+    with start_record_file_path.open(mode="r") as file_stream:
+        all_started_files_finished = all(line.rstrip("\n") in end_record for line in file_stream)
+    if not all_started_files_finished:
+        # IDEA: an advanced feature for the future could be looking at the timestamp of the 'started' log
+        # and cleaning the entire extraction directory of entries with that date (and possibly +/- a day around it)
+        message = (
+            "\nRecord corruption from previous run detected - "
+            "please call `s3logextraction reset extraction` to clean the extraction cache and records.\n\n"
+        )
+        raise ValueError(message)
+
+    return end_record
+
+
+def _merge_files_into_extraction(
     *,
-    source_file_path: pathlib.Path,
+    source_file_paths: list[pathlib.Path],
     destination_file_path: pathlib.Path,
     use_encryption: bool,
 ) -> None:
-    """Merge a single `.txt` file from `source_file_path` into `destination_file_path`.
+    """Merge one or more `.txt` files from `source_file_paths`, in order, into `destination_file_path`.
 
     For ``ips.txt`` files, the existing encrypted destination is decrypted, merged with the new
-    plaintext IPs, and re-encrypted. All other files are appended as raw bytes.
+    plaintext IPs of every source, and re-encrypted once. All other files are appended as raw bytes
+    through a single handle.
     """
-    if use_encryption and source_file_path.name == "ips.txt":
-        new_ips = _read_ips_from_file(file_path=source_file_path, use_encryption=False)
-        existing_ips = (
+    if use_encryption and destination_file_path.name == "ips.txt":
+        # Decrypt and re-encrypt the destination once, no matter how many sources are being merged into it
+        ips = (
             _read_ips_from_file(file_path=destination_file_path, use_encryption=True)
             if destination_file_path.exists()
             else []
         )
-        _write_ips_to_file(
-            file_path=destination_file_path,
-            ips=[*existing_ips, *new_ips],
-            use_encryption=True,
-        )
+        for source_file_path in source_file_paths:
+            ips.extend(_read_ips_from_file(file_path=source_file_path, use_encryption=False))
+        _write_ips_to_file(file_path=destination_file_path, ips=ips, use_encryption=True)
     else:
-        content = source_file_path.read_bytes()
+        # Hand the combined payload to a single write call
+        content = b"".join(source_file_path.read_bytes() for source_file_path in source_file_paths)
         with destination_file_path.open(mode="ab") as file_stream:
             file_stream.write(content)
 
@@ -45,12 +90,16 @@ def _merge_dir_to_extraction(
     For ``ips.txt`` files, existing encrypted content is decrypted, merged with new plaintext
     IPs, and re-encrypted. All other files are appended as raw bytes.
     """
+    # Each object contributes several files to the same directory, so only create each directory once
+    created_directories: set[pathlib.Path] = set()
     for file_path in source_dir.rglob(pattern="*.txt"):
         relative_parts = file_path.relative_to(source_dir).parts
         destination_file_path = extraction_directory / pathlib.Path(*relative_parts)
-        destination_file_path.parent.mkdir(parents=True, exist_ok=True)
-        _merge_file_into_extraction(
-            source_file_path=file_path,
+        if destination_file_path.parent not in created_directories:
+            destination_file_path.parent.mkdir(parents=True, exist_ok=True)
+            created_directories.add(destination_file_path.parent)
+        _merge_files_into_extraction(
+            source_file_paths=[file_path],
             destination_file_path=destination_file_path,
             use_encryption=use_encryption,
         )
@@ -58,10 +107,11 @@ def _merge_dir_to_extraction(
 
 def _deploy_subprocess(
     *,
-    command: str,
+    command: list[str],
     environment_variables: dict[str, str] | None = None,
     error_message: str | None = None,
     ignore_errors: bool = False,
+    capture_stdout: bool = True,
 ) -> str | None:
     error_message = error_message or "An error occurred while executing the command."
 
@@ -71,19 +121,24 @@ def _deploy_subprocess(
     if environment_variables is not None:
         env.update(environment_variables)
 
+    # The command is executed directly rather than through a shell, so paths with spaces or shell metacharacters
+    # are passed through as-is and no intermediate shell process is spawned per call
+    # Commands whose output is never used send it straight to the null device instead of through a pipe to be decoded
     result = subprocess.run(
         args=command,
         env=env,
-        shell=True,
-        capture_output=True,
+        shell=False,
+        stdout=subprocess.PIPE if capture_stdout else subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
         text=True,
         encoding="utf-8",
     )
     if result.returncode != 0 and ignore_errors is False:
+        stdout_message = f"stdout: {result.stdout}\n\n" if capture_stdout else ""
         message = (
             f"\n\nError code {result.returncode}\n"
             f"{error_message}\n\n"
-            f"stdout: {result.stdout}\n\n"
+            f"{stdout_message}"
             f"stderr: {result.stderr}\n\n"
         )
         raise RuntimeError(message)
@@ -1,3 +1,4 @@
+import os
 import pathlib
 import typing
 
@@ -46,6 +47,9 @@ def write_ip_cache(
 ) -> None:
     """Write data to an IP cache file, optionally encrypting the content.
 
+    The content is first written to a temporary file next to the cache and then moved into place, so an interrupted
+    write can never leave a truncated (or undecryptable) cache behind.
+
     Parameters
     ----------
     data : dict
@@ -62,4 +66,14 @@ def write_ip_cache(
     cache_file_path = ip_cache_directory / f"{cache_type}.yaml"
 
     text = yaml.dump(data=data)
-    write_text_to_file(file_path=cache_file_path, text=text, use_encryption=use_encryption)
+    _write_text_atomically(file_path=cache_file_path, text=text, use_encryption=use_encryption)
+
+
+def _write_text_atomically(*, file_path: pathlib.Path, text: str, use_encryption: bool) -> None:
+    # Write to a sibling file and swap it into place, removing the sibling if anything fails before the swap
+    temporary_file_path = file_path.with_name(f".{file_path.name}.{os.getpid()}.tmp")
+    try:
+        write_text_to_file(file_path=temporary_file_path, text=text, use_encryption=use_encryption)
+        os.replace(src=temporary_file_path, dst=file_path)
+    finally:
+        temporary_file_path.unlink(missing_ok=True)
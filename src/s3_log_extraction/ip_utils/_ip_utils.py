@@ -18,7 +18,9 @@ def _read_ips_from_file(file_path: pathlib.Path, use_encryption: bool = True) ->
         If ``False``, the file content is read as plaintext.
     """
     text = read_text_from_file(file_path=file_path, use_encryption=use_encryption)
-    return [stripped for line in text.splitlines() if (stripped := line.strip())]
+    # IP addresses never contain whitespace, so a single whitespace split yields exactly the stripped, non-empty lines
+    # without a Python-level pass over each of them
+    return text.split()
 
 
 def _write_ips_to_file(file_path: pathlib.Path, ips: list[str], use_encryption: bool = True) -> None:
@@ -38,38 +40,97 @@ def _write_ips_to_file(file_path: pathlib.Path, ips: list[str], use_encryption:
     write_text_to_file(file_path=file_path, text=text, use_encryption=use_encryption)
 
 
-def _ip_in_cidr(ip_address: str, cidr_address: str) -> bool:
-    """Return True if ``ip_address`` falls within ``cidr_address``, False otherwise.
+def _find_cidr_address_and_subregion(*, ip_address: str, service_name: str) -> tuple[str, str | None] | None:
+    """Return the first CIDR range (and its subregion) of the service that contains the IP, or None if there is none.
 
-    Uses ``strict=False`` to accept CIDRs that have host bits set, and returns
-    ``False`` for any entry that is not a valid CIDR string.
+    Only one dictionary probe per distinct prefix length of the service is needed, instead of a containment test
+    against every one of its (possibly tens of thousands of) ranges.
     """
     try:
-        return ipaddress.ip_address(address=ip_address) in ipaddress.ip_network(address=cidr_address, strict=False)
-    except ValueError as exception:
-        warnings.warn(
-            message=(f"Skipping invalid CIDR entry {cidr_address!r} while checking IP {ip_address!r}: {exception}"),
-            stacklevel=2,
-        )
-        return False
+        ip = ipaddress.ip_address(address=ip_address)
+    except ValueError:
+        return None
+
+    ip_integer = int(ip)
+    matches = []
+    for (version, prefix_length), networks in _get_cidr_lookup(service_name=service_name).items():
+        if version != ip.version:
+            continue
+
+        host_bits = ip.max_prefixlen - prefix_length
+        match = networks.get(ip_integer >> host_bits << host_bits)
+        if match is not None:
+            matches.append(match)
+
+    # Ranges may overlap (e.g., a regional AWS prefix nested inside a broader one), so keep the earliest listed
+    if not matches:
+        return None
+    _, cidr_address, subregion = min(matches, key=lambda match: match[0])
+    return cidr_address, subregion
+
+
+@functools.lru_cache
+def _get_cidr_lookup(*, service_name: str) -> dict[tuple[int, int], dict[int, tuple[int, str, str | None]]]:
+    """Index the CIDR ranges of a service by IP version and prefix length, then by network address.
+
+    Each entry holds the position of the range in the service listing alongside the range and its subregion.
+    Uses ``strict=False`` to accept CIDRs that have host bits set, and skips (with a warning) any entry that is
+    not a valid CIDR string.
+    """
+    cidr_addresses_and_subregions = _get_cidr_address_ranges_and_subregions(service_name=service_name)
+
+    lookup: dict[tuple[int, int], dict[int, tuple[int, str, str | None]]] = {}
+    for position, (cidr_address, subregion) in enumerate(cidr_addresses_and_subregions):
+        try:
+            network = ipaddress.ip_network(address=cidr_address, strict=False)
+        except ValueError as exception:
+            warnings.warn(
+                message=f"Skipping invalid CIDR entry {cidr_address!r} for service {service_name!r}: {exception}",
+                stacklevel=2,
+            )
+            continue
+
+        networks = lookup.setdefault((network.version, network.prefixlen), {})
+        networks.setdefault(int(network.network_address), (position, cidr_address, subregion))
+
+    return lookup
+
+
+@functools.cache
+def _get_requests_session() -> "requests.Session":
+    """Share a single keep-alive session (with retries on transient failures) across all service requests."""
+    import requests
+    import requests.adapters
+    import urllib3.util.retry
+
+    retry = urllib3.util.retry.Retry(total=5, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504))
+    session = requests.Session()
+    session.mount(prefix="https://", adapter=requests.adapters.HTTPAdapter(max_retries=retry))
+
+    return session
 
 
 @functools.lru_cache
 def _request_cidr_range(service_name: str) -> dict:
     """Cache (in-memory) the requests to external services."""
-    import requests
+    session = _get_requests_session()
+    timeout_in_seconds = 30
 
     match service_name:
         case "GitHub":
-            github_cidr_request = requests.get(url="https://api.github.com/meta").json()
+            github_cidr_request = session.get(url="https://api.github.com/meta", timeout=timeout_in_seconds).json()
 
             return github_cidr_request
         case "AWS":
-            aws_cidr_request = requests.get(url="https://ip-ranges.amazonaws.com/ip-ranges.json").json()
+            aws_cidr_request = session.get(
+                url="https://ip-ranges.amazonaws.com/ip-ranges.json", timeout=timeout_in_seconds
+            ).json()
 
             return aws_cidr_request
         case "GCP":
-            gcp_cidr_request = requests.get(url="https://www.gstatic.com/ipranges/cloud.json").json()
+            gcp_cidr_request = session.get(
+                url="https://www.gstatic.com/ipranges/cloud.json", timeout=timeout_in_seconds
+            ).json()
 
             return gcp_cidr_request
         case "Azure":
@@ -77,8 +138,9 @@ def _request_cidr_range(service_name: str) -> dict:
         case "VPN":
             # Very nice public and maintained listing! Hope this stays stable.
             vpn_cidr_request = (
-                requests.get(
-                    url="https://raw.githubusercontent.com/josephrocca/is-vpn/main/vpn-or-datacenter-ipv4-ranges.txt"
+                session.get(
+                    url="https://raw.githubusercontent.com/josephrocca/is-vpn/main/vpn-or-datacenter-ipv4-ranges.txt",
+                    timeout=timeout_in_seconds,
                 )
                 .content.decode("utf-8")
                 .splitlines()
@@ -10,7 +10,7 @@ import tqdm
 
 from ._globals import _KNOWN_SERVICES
 from ._ip_cache import load_ip_cache, write_ip_cache
-from ._ip_utils import _get_cidr_address_ranges_and_subregions, _ip_in_cidr, _read_ips_from_file
+from ._ip_utils import _find_cidr_address_and_subregion, _read_ips_from_file
 from ..config import get_cache_directory
 
 
@@ -63,7 +63,7 @@ def update_ip_to_region_codes(
         cache_type="ip_to_region", cache_directory=cache_directory, use_encryption=use_encryption
     )
     # Skip IPs already in the cache (including "undetermined"); use the refresh command to retry those
-    ips_to_update = list(all_ips - set(ip_to_region.keys()))
+    ips_to_update = list(all_ips - ip_to_region.keys())
 
     # If a batch limit is set, shuffle the IPs to ensure repeated runs update different IPs
     if batch_limit is not None:
@@ -114,15 +114,8 @@ def _get_region_code_from_ip_address(
     # https://learn.microsoft.com/en-us/answers/questions/1410071/up-to-date-azure-public-api-to-get-azure-ip-ranges
     # maybe it will change in the future
     for service_name in _KNOWN_SERVICES:
-        cidr_addresses_and_subregions = _get_cidr_address_ranges_and_subregions(service_name=service_name)
-
-        matched_cidr_address_and_subregion = next(
-            (
-                (cidr_address, subregion)
-                for cidr_address, subregion in cidr_addresses_and_subregions
-                if _ip_in_cidr(ip_address=ip_address, cidr_address=cidr_address)
-            ),
-            None,
+        matched_cidr_address_and_subregion = _find_cidr_address_and_subregion(
+            ip_address=ip_address, service_name=service_name
         )
         if matched_cidr_address_and_subregion is not None:
             region_service_string = service_name
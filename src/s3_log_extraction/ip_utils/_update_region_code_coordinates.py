@@ -1,12 +1,15 @@
+import concurrent.futures
+import functools
 import os
 import pathlib
+import threading
 
 import natsort
 import tqdm
 import yaml
 
 from ._globals import _DEFAULT_REGION_CODES_TO_COORDINATES, _KNOWN_SERVICES
-from ._ip_cache import load_ip_cache, write_ip_cache
+from ._ip_cache import _write_text_atomically, load_ip_cache, write_ip_cache
 from ._ip_utils import _get_cidr_address_ranges_and_subregions
 from ..config import get_cache_subdirectory
 
@@ -14,6 +17,7 @@ from ..config import get_cache_subdirectory
 def update_region_code_coordinates(
     cache_directory: str | pathlib.Path | None = None,
     use_encryption: bool = True,
+    workers: int = 1,
 ) -> None:
     """
     Update the `region_codes_to_coordinates.yaml` file in the cache directory.
@@ -26,10 +30,11 @@ def update_region_code_coordinates(
     use_encryption : bool
         If ``True`` (default), IP cache files are decrypted when reading and encrypted when writing.
         If ``False``, IP cache files are read and written as plaintext.
+    workers : int
+        Number of geocoding requests to keep in flight at once.
+        The lookups are network-bound, so threads are used rather than processes.
+        Default is 1, which respects the request rate of the free OpenCage plan.
     """
-    import ipinfo
-    import opencage.geocoder
-
     opencage_api_key = os.environ.get("OPENCAGE_API_KEY", None)
     ipinfo_api_key = os.environ.get("IPINFO_API_KEY", None)
 
@@ -38,8 +43,6 @@ def update_region_code_coordinates(
         if api_key is None:
             message = f"`{environment_variable_name}` environment variable is not set."
             raise ValueError(message)
-    ipinfo_client = ipinfo.getHandler(access_token=ipinfo_api_key)
-    opencage_client = opencage.geocoder.OpenCageGeocode(key=opencage_api_key)
 
     ip_cache_directory = get_cache_subdirectory(cache_directory=cache_directory, name="ips")
 
@@ -57,8 +60,10 @@ def update_region_code_coordinates(
         service_coordinates_file_path.touch()
     with service_coordinates_file_path.open(mode="r") as file_stream:
         service_coordinates = yaml.safe_load(stream=file_stream) or {}
+    previous_service_coordinates = dict(service_coordinates)
 
-    region_codes_to_coordinates: dict[str, dict[str, float]] = _DEFAULT_REGION_CODES_TO_COORDINATES
+    # Copy so that the module-level defaults are never polluted by the entries of a particular cache
+    region_codes_to_coordinates: dict[str, dict[str, float]] = dict(_DEFAULT_REGION_CODES_TO_COORDINATES)
     previous_region_codes_to_coordinates = load_ip_cache(
         cache_type="region_codes_to_coordinates", cache_directory=cache_directory, use_encryption=use_encryption
     )
@@ -67,42 +72,58 @@ def update_region_code_coordinates(
     ip_to_region = load_ip_cache(
         cache_type="ip_to_region", cache_directory=cache_directory, use_encryption=use_encryption
     )
-    region_codes_to_update = set(ip_to_region.values()) - set(region_codes_to_coordinates.keys())
+    # Deduplicate once up front. IPs that could not be resolved to any region are cached as null and have no
+    # coordinates. Bogons and the other excluded labels are already covered by the default entries.
+    unique_region_codes = set(ip_to_region.values())
+    unique_region_codes.discard(None)
+    region_codes_to_update = unique_region_codes - region_codes_to_coordinates.keys()
     opencage_failures = []
-    for country_and_region_code in tqdm.tqdm(
-        iterable=region_codes_to_update,
-        total=len(region_codes_to_update),
-        desc="Updating region coordinates",
-        smoothing=0,
-        unit="regions",
-    ):
-        # Bogon IPs do not have coordinates, so skip
-        if country_and_region_code == "bogon":
-            continue
-
-        coordinates = _get_coordinates_from_region_code(
-            country_and_region_code=country_and_region_code,
-            ipinfo_client=ipinfo_client,
-            opencage_client=opencage_client,
-            service_coordinates=service_coordinates,
-            opencage_failures=opencage_failures,
-        )
+    # The worker threads only read the coordinates loaded from disk and each uses its own API clients.
+    # Every shared structure is updated here in the main thread as the results arrive.
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(
+                _get_coordinates_from_region_code,
+                country_and_region_code=country_and_region_code,
+                ipinfo_api_key=ipinfo_api_key,
+                opencage_api_key=opencage_api_key,
+                service_coordinates=previous_service_coordinates,
+            )
+            for country_and_region_code in region_codes_to_update
+        ]
+        for future in tqdm.tqdm(
+            iterable=concurrent.futures.as_completed(futures),
+            total=len(futures),
+            desc="Updating region coordinates",
+            smoothing=0,
+            unit="regions",
+        ):
+            country_and_region_code, coordinates, is_service = future.result()
+
+            if coordinates is None:
+                opencage_failures.append(country_and_region_code)
+                continue
 
-        if coordinates is not None:
             region_codes_to_coordinates[country_and_region_code] = coordinates
+            if is_service:
+                service_coordinates[country_and_region_code] = coordinates
 
     region_codes_to_coordinates_ordered = {
         key: region_codes_to_coordinates[key] for key in natsort.natsorted(seq=region_codes_to_coordinates.keys())
     }
 
-    write_ip_cache(
-        data=region_codes_to_coordinates_ordered,
-        cache_type="region_codes_to_coordinates",
-        cache_directory=cache_directory,
-        use_encryption=use_encryption,
-    )
-    with service_coordinates_file_path.open(mode="w") as file_stream:
-        yaml.dump(data=service_coordinates, stream=file_stream)
+    # Skip rewriting (and re-encrypting) the caches when nothing was resolved during this run
+    if region_codes_to_coordinates_ordered != previous_region_codes_to_coordinates:
+        write_ip_cache(
+            data=region_codes_to_coordinates_ordered,
+            cache_type="region_codes_to_coordinates",
+            cache_directory=cache_directory,
+            use_encryption=use_encryption,
+        )
+    if service_coordinates != previous_service_coordinates:
+        _write_text_atomically(
+            file_path=service_coordinates_file_path, text=yaml.dump(data=service_coordinates), use_encryption=False
+        )
 
     if any(opencage_failures):
         message = (
@@ -115,11 +136,10 @@ def update_region_code_coordinates(
 def _get_coordinates_from_region_code(
     *,
     country_and_region_code: str,
-    ipinfo_client: "ipinfo.Handler",
-    opencage_client: "opencage.geocoder.OpenCageGeocode",
+    ipinfo_api_key: str,
+    opencage_api_key: str,
     service_coordinates: dict[str, dict[str, float]],
-    opencage_failures: list[str],
-) -> dict[str, float]:
+) -> tuple[str, dict[str, float] | None, bool]:
     """
     Get the coordinates for a region code.
 
@@ -129,20 +149,31 @@ def _get_coordinates_from_region_code(
     ----------
     country_and_region_code : str
         The region code to get the coordinates for.
-    ipinfo_client : ipinfo.Handler
-        The IPInfo handler to use for fetching coordinates.
+    ipinfo_api_key : str
+        The IPInfo API key.
     opencage_api_key : str
         The OpenCage API key.
     service_coordinates : dict[str, dict[str, float]]
         A dictionary containing the coordinates of known services.
+        It is only read, so it may be shared between threads.
 
     Returns
     -------
-    dict[str, float]
+    country_and_region_code : str
+        The region code that was looked up.
+    coordinates : dict[str, float] | None
         A dictionary containing the latitude and longitude of the region code.
+        None if the region code could not be resolved.
+    is_service : bool
+        Whether the region code belongs to a known service.
     """
+    ipinfo_client, opencage_client = _get_thread_clients(
+        ipinfo_api_key=ipinfo_api_key, opencage_api_key=opencage_api_key
+    )
+
     country_code = country_and_region_code.split("/")[0]
-    if country_code in _KNOWN_SERVICES:
+    is_service = country_code in _KNOWN_SERVICES
+    if is_service:
         coordinates = _get_service_coordinates_from_ipinfo(
             country_and_region_code=country_and_region_code,
             ipinfo_client=ipinfo_client,
@@ -150,12 +181,28 @@ def _get_coordinates_from_region_code(
         )
     else:
         coordinates = _get_coordinates_from_opencage(
-            country_and_region_code=country_and_region_code,
-            opencage_client=opencage_client,
-            opencage_failures=opencage_failures,
+            country_and_region_code=country_and_region_code, opencage_client=opencage_client
         )
 
-    return coordinates
+    return country_and_region_code, coordinates, is_service
+
+
+# The thread safety of the API clients is not documented, so every worker thread makes its own
+_thread_local = threading.local()
+
+
+def _get_thread_clients(
+    *, ipinfo_api_key: str, opencage_api_key: str
+) -> tuple["ipinfo.Handler", "opencage.geocoder.OpenCageGeocode"]:
+    import ipinfo
+    import opencage.geocoder
+
+    if not hasattr(_thread_local, "clients"):
+        ipinfo_client = ipinfo.getHandler(access_token=ipinfo_api_key)
+        opencage_client = opencage.geocoder.OpenCageGeocode(key=opencage_api_key)
+        _thread_local.clients = (ipinfo_client, opencage_client)
+
+    return _thread_local.clients
 
 
 def _get_service_coordinates_from_ipinfo(
@@ -167,27 +214,33 @@ def _get_service_coordinates_from_ipinfo(
     # Note that services with a single code (e.g., "GitHub") should be handled via the global default dictionary
     service_name, subregion = country_and_region_code.split("/")
 
-    coordinates = service_coordinates.get(service_name, None)
+    # Entries are stored under the full region code (e.g., "AWS/us-east-1"), so they must be looked up the same way
+    coordinates = service_coordinates.get(country_and_region_code, None)
     if coordinates is not None:
         return coordinates
 
-    cidr_addresses_and_subregions = _get_cidr_address_ranges_and_subregions(service_name=service_name)
-    subregion_to_cidr_address = {subregion: cidr_address for cidr_address, subregion in cidr_addresses_and_subregions}
-
+    subregion_to_cidr_address = _get_subregion_to_cidr_address(service_name=service_name)
     ip_address = subregion_to_cidr_address[subregion].split("/")[0]
     details = ipinfo_client.getDetails(ip_address=ip_address).details
     latitude = details["latitude"]
     longitude = details["longitude"]
     coordinates = {"latitude": latitude, "longitude": longitude}
 
-    service_coordinates[country_and_region_code] = coordinates
-
     return coordinates
 
 
+@functools.cache
+def _get_subregion_to_cidr_address(*, service_name: str) -> dict[str | None, str]:
+    """Map each subregion of a service to one representative CIDR address, built once per service."""
+    cidr_addresses_and_subregions = _get_cidr_address_ranges_and_subregions(service_name=service_name)
+    subregion_to_cidr_address = {subregion: cidr_address for cidr_address, subregion in cidr_addresses_and_subregions}
+
+    return subregion_to_cidr_address
+
+
 def _get_coordinates_from_opencage(
-    *, country_and_region_code: str, opencage_client: "opencage.geocoder.OpenCageGeocode", opencage_failures: list[str]
-) -> dict[str, float]:
+    *, country_and_region_code: str, opencage_client: "opencage.geocoder.OpenCageGeocode"
+) -> dict[str, float] | None:
     """
     Use the OpenCage API to get the coordinates (in decimal degrees form) for a ISO 3166 country/region code.
 
@@ -197,8 +250,7 @@ def _get_coordinates_from_opencage(
     results = opencage_client.geocode(country_and_region_code)
 
     if not any(results):
-        opencage_failures.append(country_and_region_code)
-        return
+        return None
 
     latitude = results[0]["geometry"]["lat"]
     longitude = results[0]["geometry"]["lng"]
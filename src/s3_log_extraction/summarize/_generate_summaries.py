@@ -1,5 +1,4 @@
 import collections
-import datetime
 import pathlib
 
 import pandas
@@ -49,6 +48,82 @@ def _privacy_round_request_download_columns(
     return summary_table
 
 
+def _read_values(*, file_path: pathlib.Path, dtype: str) -> pandas.Series:
+    """
+    Read a single-column extraction file (one value per line) with the C tokenizer of `pandas.read_csv`.
+
+    Parameters
+    ----------
+    file_path : pathlib.Path
+        Path to the extraction file, such as ``timestamps.txt`` or ``bytes_sent.txt``.
+    dtype : str
+        The dtype to parse the values as.
+
+    Returns
+    -------
+    pandas.Series
+        The values of the file, in order.
+    """
+    if file_path.stat().st_size == 0:
+        return pandas.Series(data=[], dtype=dtype)
+
+    table = pandas.read_csv(
+        filepath_or_buffer=file_path, header=None, names=["value"], dtype={"value": dtype}, engine="c", na_filter=False
+    )
+    return table["value"]
+
+
+def _read_download_values(*, file_path: pathlib.Path, number_of_requests: int) -> pandas.Series:
+    """
+    Read the download flags of an asset, treating every request as a non-download if the file was never written.
+
+    Parameters
+    ----------
+    file_path : pathlib.Path
+        Path to the ``download.txt`` extraction file of the asset.
+    number_of_requests : int
+        The number of requests recorded for the asset, used when the file does not exist.
+
+    Returns
+    -------
+    pandas.Series
+        The ``int64`` download flag of each request, in order.
+    """
+    if not file_path.exists():
+        return pandas.Series(data=0, index=range(number_of_requests), dtype="int64")
+
+    return _read_values(file_path=file_path, dtype="int64")
+
+
+def _aggregate_activity(*, activity: pandas.DataFrame, by: str) -> pandas.DataFrame:
+    """
+    Aggregate per-request activity into the totals reported by a summary table.
+
+    Parameters
+    ----------
+    activity : pandas.DataFrame
+        One row per request, with the ``by`` column alongside ``bytes_sent`` and ``download`` columns.
+    by : str
+        The column to group the requests by.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per distinct value of ``by``, in order of first appearance, with the total ``bytes_sent``,
+        ``number_of_requests``, and ``number_of_downloads``.
+    """
+    summary_table = (
+        activity.groupby(by=by, sort=False, dropna=False)
+        .agg(
+            bytes_sent=("bytes_sent", "sum"),
+            number_of_requests=("bytes_sent", "size"),
+            number_of_downloads=("download", "sum"),
+        )
+        .reset_index()
+    )
+    return summary_table
+
+
 def _collect_unique_ips(asset_directories: list[pathlib.Path], use_encryption: bool = True) -> set[str]:
     """
     Collect all unique IP addresses across the given asset directories.
@@ -232,7 +307,7 @@ def _summarize_dataset(
 def _summarize_dataset_by_day(
     *, asset_directories: list[pathlib.Path], summary_file_path: pathlib.Path, privacy_threshold_minimum: int = 50
 ) -> None:
-    all_dates = []
+    all_timestamps = []
     all_bytes_sent = []
     all_downloads = []
     for asset_directory in asset_directories:
@@ -244,44 +319,34 @@ def _summarize_dataset_by_day(
         if not timestamps_file_path.exists():
             continue
 
-        dates = [
-            datetime.datetime.strptime(str(timestamp.strip()), "%y%m%d%H%M%S").strftime(format="%Y-%m-%d")
-            for timestamp in timestamps_file_path.read_text().splitlines()
-        ]
-        all_dates.extend(dates)
+        timestamps = _read_values(file_path=timestamps_file_path, dtype="int64")
+        all_timestamps.append(timestamps)
 
         bytes_sent_file_path = asset_directory / "bytes_sent.txt"
-        bytes_sent = [int(value.strip()) for value in bytes_sent_file_path.read_text().splitlines()]
-        all_bytes_sent.extend(bytes_sent)
+        all_bytes_sent.append(_read_values(file_path=bytes_sent_file_path, dtype="int64"))
 
         download_file_path = asset_directory / "download.txt"
-        if download_file_path.exists():
-            downloads = [int(value.strip()) for value in download_file_path.read_text().splitlines()]
-        else:
-            downloads = [0] * len(dates)
-        all_downloads.extend(downloads)
-
-    summarized_activity_by_day = collections.defaultdict(int)
-    number_of_requests_by_day = collections.defaultdict(int)
-    number_of_downloads_by_day = collections.defaultdict(int)
-    for date, bytes_sent, download in zip(all_dates, all_bytes_sent, all_downloads):
-        summarized_activity_by_day[date] += bytes_sent
-        number_of_requests_by_day[date] += 1
-        number_of_downloads_by_day[date] += download
-
-    if len(summarized_activity_by_day) == 0:
+        all_downloads.append(_read_download_values(file_path=download_file_path, number_of_requests=len(timestamps)))
+
+    if sum(len(bytes_sent) for bytes_sent in all_bytes_sent) == 0:
         return
 
-    summary_file_path.parent.mkdir(parents=True, exist_ok=True)
-    all_dates_ordered = list(summarized_activity_by_day.keys())
-    summary_table = pandas.DataFrame(
+    # The timestamps are read as YYMMDDhhmmss integers, so the day of each request is found by integer division alone
+    # Only the distinct days are then converted to dates, rather than parsing a datetime for every request
+    activity = pandas.DataFrame(
         data={
-            "date": all_dates_ordered,
-            "bytes_sent": list(summarized_activity_by_day.values()),
-            "number_of_requests": [number_of_requests_by_day[date] for date in all_dates_ordered],
-            "number_of_downloads": [number_of_downloads_by_day[date] for date in all_dates_ordered],
+            "day": pandas.concat(objs=all_timestamps, ignore_index=True).to_numpy() // 1_000_000,
+            "bytes_sent": pandas.concat(objs=all_bytes_sent, ignore_index=True).to_numpy(),
+            "download": pandas.concat(objs=all_downloads, ignore_index=True).to_numpy(),
         }
     )
+    summary_table = _aggregate_activity(activity=activity, by="day")
+    days = summary_table.pop(item="day").astype(dtype="str").str.zfill(width=6)
+    summary_table.insert(
+        loc=0, column="date", value=pandas.to_datetime(arg=days, format="%y%m%d").dt.strftime(date_format="%Y-%m-%d")
+    )
+
+    summary_file_path.parent.mkdir(parents=True, exist_ok=True)
     summary_table.sort_values(by="date", inplace=True)
     summary_table.index = range(len(summary_table))
     summary_table = _privacy_round_request_download_columns(
@@ -307,16 +372,16 @@ def _summarize_dataset_by_asset(
         if not bytes_sent_file_path.exists():
             continue
 
-        bytes_sent = [int(value.strip()) for value in bytes_sent_file_path.read_text().splitlines()]
+        bytes_sent = _read_values(file_path=bytes_sent_file_path, dtype="int64")
 
         asset_path = str(asset_directory.relative_to(extraction_base_path))
-        summarized_activity_by_asset[asset_path] += sum(bytes_sent)
+        summarized_activity_by_asset[asset_path] += int(bytes_sent.sum())
         number_of_requests_by_asset[asset_path] += len(bytes_sent)
 
         download_file_path = asset_directory / "download.txt"
         if download_file_path.exists():
-            downloads = [int(value.strip()) for value in download_file_path.read_text().splitlines()]
-            number_of_downloads_by_asset[asset_path] += sum(downloads)
+            downloads = _read_values(file_path=download_file_path, dtype="int64")
+            number_of_downloads_by_asset[asset_path] += int(downloads.sum())
         else:
             number_of_downloads_by_asset[asset_path] += 0
 
@@ -347,7 +412,7 @@ def _summarize_dataset_by_region(
     use_encryption: bool = True,
     privacy_threshold_minimum: int = 50,
 ) -> None:
-    all_regions = []
+    all_ips = []
     all_bytes_sent = []
     all_downloads = []
     for asset_directory in asset_directories:
@@ -359,41 +424,32 @@ def _summarize_dataset_by_region(
             continue
 
         full_ips = _read_ips_from_file(file_path=full_ips_file_path, use_encryption=use_encryption)
-        regions = [ip_to_region.get(ip, "missing") for ip in full_ips]
-        all_regions.extend(regions)
+        all_ips.extend(full_ips)
 
         bytes_sent_file_path = asset_directory / "bytes_sent.txt"
-        bytes_sent = [int(value.strip()) for value in bytes_sent_file_path.read_text().splitlines()]
-        all_bytes_sent.extend(bytes_sent)
+        all_bytes_sent.append(_read_values(file_path=bytes_sent_file_path, dtype="int64"))
 
         download_file_path = asset_directory / "download.txt"
-        if download_file_path.exists():
-            downloads = [int(value.strip()) for value in download_file_path.read_text().splitlines()]
-        else:
-            downloads = [0] * len(regions)
-        all_downloads.extend(downloads)
-
-    summarized_activity_by_region = collections.defaultdict(int)
-    number_of_requests_by_region = collections.defaultdict(int)
-    number_of_downloads_by_region = collections.defaultdict(int)
-    for region, bytes_sent, download in zip(all_regions, all_bytes_sent, all_downloads):
-        summarized_activity_by_region[region] += bytes_sent
-        number_of_requests_by_region[region] += 1
-        number_of_downloads_by_region[region] += download
-
-    if len(summarized_activity_by_region) == 0:
+        all_downloads.append(_read_download_values(file_path=download_file_path, number_of_requests=len(full_ips)))
+
+    if len(all_ips) == 0:
         return
 
-    summary_file_path.parent.mkdir(parents=True, exist_ok=True)
-    all_regions_ordered = list(summarized_activity_by_region.keys())
-    summary_table = pandas.DataFrame(
+    activity = pandas.DataFrame(
         data={
-            "region": all_regions_ordered,
-            "bytes_sent": list(summarized_activity_by_region.values()),
-            "number_of_requests": [number_of_requests_by_region[region] for region in all_regions_ordered],
-            "number_of_downloads": [number_of_downloads_by_region[region] for region in all_regions_ordered],
+            "ip": all_ips,
+            "bytes_sent": pandas.concat(objs=all_bytes_sent, ignore_index=True).to_numpy(),
+            "download": pandas.concat(objs=all_downloads, ignore_index=True).to_numpy(),
         }
     )
+    activity_by_ip = _aggregate_activity(activity=activity, by="ip")
+
+    # Most requests come from repeat requesters, so look up the region once per distinct IP rather than per request
+    # Regions the IP cache could not resolve are `None` and must still be reported, hence `dropna=False`
+    activity_by_ip["region"] = [ip_to_region.get(ip, "missing") for ip in activity_by_ip["ip"]]
+    summary_table = activity_by_ip.drop(columns="ip").groupby(by="region", sort=False, dropna=False).sum().reset_index()
+
+    summary_file_path.parent.mkdir(parents=True, exist_ok=True)
     summary_table = _privacy_round_request_download_columns(
         summary_table=summary_table, minimum=privacy_threshold_minimum
     )
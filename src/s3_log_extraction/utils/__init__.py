@@ -1,4 +1,4 @@
-from . import encryption, inventory, parallel
+from . import encryption, inventory, parallel, walk
 from .encryption import (
     decrypt_bytes,
     encrypt_bytes,
@@ -37,5 +37,6 @@ __all__ = [
     "parallel",
     "read_text_from_file",
     "validate_password_strength",
+    "walk",
     "write_text_to_file",
 ]
@@ -1,4 +1,5 @@
 import base64
+import functools
 import math
 import os
 import pathlib
@@ -96,7 +97,18 @@ def get_key() -> bytes:
     salt = os.environ.get("S3_LOG_EXTRACTION_SALT", None)
     salt_bytes = salt.encode(encoding="utf-8") if salt is not None else _DEFAULT_SALT
 
-    password_bytes = password.encode(encoding="utf-8")
+    key = _derive_key(password_bytes=password.encode(encoding="utf-8"), salt_bytes=salt_bytes)
+    return key
+
+
+@functools.lru_cache(maxsize=1)
+def _derive_key(*, password_bytes: bytes, salt_bytes: bytes) -> bytes:
+    """
+    Run the PBKDF2 derivation, which is deliberately slow, only once per password and salt in each process.
+
+    The cache holds secrets, namely the plaintext password and the derived key.
+    It keeps only the most recent pair, which is the one held in the environment anyway.
+    """
     kdf = cryptography.hazmat.primitives.kdf.pbkdf2.PBKDF2HMAC(
         algorithm=cryptography.hazmat.primitives.hashes.SHA256(),
         length=32,
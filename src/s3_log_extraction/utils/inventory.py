@@ -177,7 +177,10 @@ def get_ip_stats(
             case _:
                 return "determined"
 
-    counts = collections.Counter(_categorize(region) for region in ip_to_region.values())
+    # Many IPs share a region, so classify each distinct region once and weight it by its number of IPs
+    counts: collections.Counter[str] = collections.Counter()
+    for region, number_of_ips in collections.Counter(ip_to_region.values()).items():
+        counts[_categorize(region)] += number_of_ips
 
     def _pct(n: int) -> float:
         return (n / classified_ip_count * 100) if classified_ip_count > 0 else 0.0
@@ -515,9 +518,8 @@ def get_extraction_completion(
 
     processed_file_record_keys: set[str] = set()
     for record_file_path in record_file_paths:
-        processed_file_record_keys.update(
-            {line.strip() for line in record_file_path.read_text().splitlines() if line.strip()}
-        )
+        with record_file_path.open(mode="r") as file_stream:
+            processed_file_record_keys.update(stripped for line in file_stream if (stripped := line.strip()))
     processed_file_count = len(processed_file_record_keys)
 
     inventory_file_count = inventory_stats["file_count"]
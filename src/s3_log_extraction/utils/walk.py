@@ -0,0 +1,34 @@
+import fnmatch
+import os
+import pathlib
+import typing
+
+
+def _walk_file_paths(*, directory: str | pathlib.Path, pattern: str) -> typing.Generator[str]:
+    """
+    Recursively yield the absolute paths of all files under a directory whose names match a glob pattern.
+
+    Unlike `pathlib.Path.rglob`, the walk works directly on the `os.DirEntry` objects from `os.scandir`, so no `Path`
+    is built for entries that do not match and file types come from the directory listing rather than an extra
+    `stat` per entry. Only files are yielded, and symbolic links to directories are not followed.
+
+    Parameters
+    ----------
+    directory : path-like
+        The root directory to walk.
+    pattern : str
+        The glob pattern that the name of a file must match, such as ``"*.log"``.
+
+    Yields
+    ------
+    str
+        The path of each matching file, prefixed by the absolute path of ``directory``.
+    """
+    directories_to_walk = [str(pathlib.Path(directory).absolute())]
+    while directories_to_walk:
+        with os.scandir(directories_to_walk.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    directories_to_walk.append(entry.path)
+                elif fnmatch.fnmatchcase(entry.name, pattern) and entry.is_file():
+                    yield entry.path
@@ -0,0 +1,90 @@
+import hashlib
+import os
+import pathlib
+import subprocess
+
+from ._base_validator import BaseValidator
+
+
+class BaseAwkPreValidator(BaseValidator):
+    """
+    Base class for pre-validators whose rule is an AWK script that exits with a non-zero code on any violation.
+
+    Subclasses set `awk_script_file_name` (a script alongside this module) and `check_name` (used in error messages).
+    Since the script itself is the rule, the record is tied to a checksum of its contents.
+    """
+
+    awk_script_file_name: str
+    check_name: str
+
+    def __init__(self) -> None:
+        # TODO: does this hold after bundling?
+        self._relative_awk_script_path = pathlib.Path(__file__).parent / self.awk_script_file_name
+        self._absolute_awk_script_path = str(self._relative_awk_script_path.absolute())
+
+        super().__init__()
+
+    def _compute_rule_checksum(self) -> int:
+        """
+        Compute a checksum based on the contents of the AWK validation script.
+
+        Returns
+        -------
+        int
+            Integer derived from the SHA-1 checksum of the AWK script file.
+        """
+        with self._relative_awk_script_path.open("rb") as file_stream:
+            byte_content = file_stream.read()
+
+        checksum = hashlib.sha1(string=byte_content).hexdigest()
+        checksum_int = int(checksum, 16)
+        return checksum_int
+
+    def _get_awk_environment_variables(self) -> dict[str, str]:
+        """Additional environment variables for the AWK script to read through `ENVIRON`."""
+        return {}
+
+    def _run_awk(self, *, absolute_file_paths: list[str]) -> subprocess.CompletedProcess:
+        awk_command = ["awk", "--file", self._absolute_awk_script_path, *absolute_file_paths]
+        # Extend rather than replace the environment, so that `awk` is still found on the caller's PATH
+        # The (usually empty) output is kept as bytes. It is only decoded when reporting a failure.
+        result = subprocess.run(
+            args=awk_command,
+            shell=False,
+            capture_output=True,
+            env={**os.environ, **self._get_awk_environment_variables()},
+        )
+        return result
+
+    def _run_validation(self, file_path: pathlib.Path) -> None:
+        # An empty log has no lines that could violate the rule, so there is no need to start AWK for it
+        # (this also fails fast on a missing or unreadable file, before any process is spawned)
+        if file_path.stat().st_size == 0:
+            return
+
+        absolute_file_path = str(file_path.absolute())
+
+        result = self._run_awk(absolute_file_paths=[absolute_file_path])
+        if result.returncode != 0:
+            stderr = result.stderr.decode(encoding="utf-8", errors="replace")
+            message = (
+                f"\n{self.check_name} pre-check failed.\n "
+                f"Log file: {absolute_file_path}\n"
+                f"Error code {result.returncode}\n\n"
+                f"stderr: {stderr}\n"
+            )
+            raise RuntimeError(message)
+
+    def _run_validation_on_batch(self, *, file_paths: list[pathlib.Path]) -> None:
+        non_empty_file_paths = [file_path for file_path in file_paths if file_path.stat().st_size != 0]
+        if len(non_empty_file_paths) == 0:
+            return
+
+        # A single AWK process checks the whole batch, so process start-up is paid once per batch rather than per file
+        result = self._run_awk(absolute_file_paths=[str(file_path.absolute()) for file_path in non_empty_file_paths])
+        if result.returncode == 0:
+            return
+
+        # The script stops at the first violation in any file of the batch. Check the files one at a time to report
+        # exactly which log is at fault and how many of the files before it passed.
+        super()._run_validation_on_batch(file_paths=file_paths)
@@ -1,11 +1,31 @@
 import abc
+import concurrent.futures
 import hashlib
+import itertools
+import math
 import pathlib
 import random
+import typing
 
 import tqdm
 
 from ..config import get_cache_subdirectory
+from ..utils import _handle_max_workers
+from ..utils.walk import _walk_file_paths
+
+# The number of validated files to hold in memory before appending them to the record file
+_RECORD_BATCH_SIZE = 1_000
+# The largest number of files to pass to the validation rule at once
+_VALIDATION_BATCH_SIZE = 100
+
+
+class _BatchValidationFailure(Exception):
+    """
+    Raised when a file within a batch fails validation.
+
+    The arguments are the exception raised for the failing file and the number of files before it in the batch, all of
+    which passed. Keeping both in the arguments lets the failure be sent back from a worker process intact.
+    """
 
 
 class BaseValidator(abc.ABC):
@@ -14,6 +34,15 @@ class BaseValidator(abc.ABC):
     tqdm_description = "Validating log files"
 
     def __hash__(self) -> int:
+        # A validation rule cannot change while the process is running, so the checksum is computed only once per
+        # class rather than on every instantiation (which includes every worker process of a parallel validation)
+        validator_class = type(self)
+        if "_rule_checksum" not in validator_class.__dict__:
+            validator_class._rule_checksum = self._compute_rule_checksum()
+        return validator_class._rule_checksum
+
+    def _compute_rule_checksum(self) -> int:
+        """Checksum of the validation rule, used to invalidate the record whenever the rule changes."""
         checksum = hashlib.sha1(string=self._run_validation.__code__.co_code).hexdigest()
         checksum_int = int(checksum, 16)
         return checksum_int
@@ -29,7 +58,8 @@ class BaseValidator(abc.ABC):
             return
 
         with self.record_file_path.open(mode="r") as file_stream:
-            self.record = {line.strip() for line in file_stream.readlines()}
+            # Iterate the stream directly so that large records are never also held as an intermediate list
+            self.record = {line.rstrip("\n") for line in file_stream}
 
     @abc.abstractmethod
     def _run_validation(self, file_path: pathlib.Path) -> None:
@@ -49,11 +79,44 @@ class BaseValidator(abc.ABC):
         message = "Validation rule has not been implemented for this class."
         raise NotImplementedError(message)
 
+    def _run_validation_on_batch(self, *, file_paths: list[pathlib.Path]) -> None:
+        """
+        Apply the validation rule to several log files, stopping at the first violation.
+
+        Rules with a fixed cost per call (such as starting a process) can override this to check a batch at once.
+
+        Parameters
+        ----------
+        file_paths : list of pathlib.Path
+            The file paths to validate.
+
+        Raises
+        ------
+        _BatchValidationFailure
+            Any time the validation rule detects a violation.
+            It carries the original exception and the number of files that passed before the failing one.
+        """
+        for number_of_validated_files, file_path in enumerate(file_paths):
+            try:
+                self._run_validation(file_path=file_path)
+            except Exception as exception:
+                raise _BatchValidationFailure(exception, number_of_validated_files) from exception
+
     def _record_success(self, file_path: pathlib.Path) -> None:
         """To avoid needlessly rerunning the validation process, we record the file path in a cache file."""
         with self.record_file_path.open(mode="a") as file_stream:
             file_stream.write(f"{file_path}\n")
 
+    def _record_successes(self, file_paths: list[str]) -> None:
+        """Record a batch of validated file paths with a single write to the cache file, then empty the batch."""
+        if len(file_paths) == 0:
+            return
+
+        with self.record_file_path.open(mode="a") as file_stream:
+            file_stream.write("".join(f"{file_path}\n" for file_path in file_paths))
+        self.record.update(file_paths)
+        file_paths.clear()
+
     def validate_file(self, file_path: str | pathlib.Path) -> None:
         """
         Validate the log file according to the specified rule and if successful, record result in the cache.
@@ -73,7 +136,7 @@ class BaseValidator(abc.ABC):
         self.record.add(absolute_file_path)
         self._record_success(file_path=file_path)
 
-    def validate_directory(self, directory: str | pathlib.Path, limit: int | None = None) -> None:
+    def validate_directory(self, directory: str | pathlib.Path, limit: int | None = None, workers: int = -2) -> None:
         """
         Validate all log files in the specified directory according to the specified rule.
 
@@ -85,19 +148,97 @@ class BaseValidator(abc.ABC):
             The maximum number of files to validate.
             If None, all files will be validated.
             The default is None.
+        workers : int, optional
+            The number of worker processes to validate files with.
+            Negative values count back from the number of CPUs. The default of -2 uses all but one.
         """
         directory = pathlib.Path(directory)
 
-        all_log_files = {str(file_path.absolute()) for file_path in directory.rglob(pattern="*.log")}
-        unvalidated_files = list(all_log_files - self.record)
+        # Filter against the record while walking rather than materialising every path in the directory first
+        unvalidated_files = [
+            file_path
+            for file_path in _walk_file_paths(directory=directory, pattern="*.log")
+            if file_path not in self.record
+        ]
         random.shuffle(unvalidated_files)
 
         files_to_validate = unvalidated_files[:limit] if limit is not None else unvalidated_files
-        for file_path in tqdm.tqdm(
-            iterable=files_to_validate,
-            desc=self.tqdm_description,
-            total=len(files_to_validate),
-            unit="files",
-            smoothing=0,
-        ):
-            self.validate_file(file_path=file_path)
+
+        # No point in spawning more worker processes than there are files to validate
+        max_workers = min(_handle_max_workers(workers=workers), max(len(files_to_validate), 1))
+
+        # Files are handed to the rule in batches, both to amortize any per-call cost of the rule and to keep the
+        # number of tasks sent to the worker processes small, while still giving every worker a share of the files
+        batch_size = max(min(_VALIDATION_BATCH_SIZE, math.ceil(len(files_to_validate) / max_workers)), 1)
+        batches = itertools.batched(iterable=files_to_validate, n=batch_size)
+
+        # Successes are appended to the record in batches rather than reopening the record file for every file.
+        # The batch is always flushed on the way out, so an interruption still keeps everything finished so far.
+        validated_file_paths: list[str] = []
+        progress_bar = tqdm.tqdm(desc=self.tqdm_description, total=len(files_to_validate), unit="files", smoothing=0)
+        try:
+            if max_workers == 1:
+                for batch in batches:
+                    try:
+                        self._run_validation_on_batch(file_paths=[pathlib.Path(file_path) for file_path in batch])
+                    except _BatchValidationFailure as failure:
+                        _raise_batch_failure(failure=failure, batch=batch, validated_file_paths=validated_file_paths)
+
+                    progress_bar.update(len(batch))
+                    validated_file_paths.extend(batch)
+                    if len(validated_file_paths) >= _RECORD_BATCH_SIZE:
+                        self._record_successes(file_paths=validated_file_paths)
+                return
+
+            # Only the rule itself runs in the workers. Successes are recorded by this process as results arrive, so
+            # that a single writer appends to the record file.
+            # The pool is shut down explicitly rather than through a `with` block, whose exit would wait for every
+            # remaining batch before a violation could be raised.
+            executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=max_workers, initializer=_initialize_worker, initargs=(self,)
+            )
+            try:
+                future_to_batch = {
+                    executor.submit(_run_validation_in_worker, file_paths=batch): batch for batch in batches
+                }
+                for future in concurrent.futures.as_completed(future_to_batch):
+                    batch = future_to_batch[future]
+                    try:
+                        future.result()
+                    except _BatchValidationFailure as failure:
+                        _raise_batch_failure(failure=failure, batch=batch, validated_file_paths=validated_file_paths)
+
+                    progress_bar.update(len(batch))
+                    validated_file_paths.extend(batch)
+                    if len(validated_file_paths) >= _RECORD_BATCH_SIZE:
+                        self._record_successes(file_paths=validated_file_paths)
+            except BaseException:
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+            executor.shutdown()
+        finally:
+            progress_bar.close()
+            self._record_successes(file_paths=validated_file_paths)
+
+
+def _raise_batch_failure(
+    *, failure: _BatchValidationFailure, batch: tuple[str, ...], validated_file_paths: list[str]
+) -> typing.NoReturn:
+    # The files of the batch that passed before the failing one are still recorded, so they are not checked again
+    exception, number_of_validated_files = failure.args
+    validated_file_paths.extend(batch[:number_of_validated_files])
+    raise exception from None
+
+
+# Each worker process receives its own copy of the validator once, when the pool starts, instead of having the
+# validator (including its record of every previously validated file) pickled along with every submitted file
+_worker_validator: BaseValidator | None = None
+
+
+def _initialize_worker(validator: BaseValidator) -> None:
+    global _worker_validator
+    _worker_validator = validator
+
+
+def _run_validation_in_worker(*, file_paths: tuple[str, ...]) -> None:
+    _worker_validator._run_validation_on_batch(file_paths=[pathlib.Path(file_path) for file_path in file_paths])
@@ -5,7 +5,8 @@ BEGIN {
 }
 
 {
-    if (NF == 0) {next}
+    # A cheap substring test discards most non-GET (and empty) lines before any fields are split
+    if (!index($0, "REST.GET.OBJECT")) {next}
 
     split($1, pre_uri_fields, " ")
     request_type = pre_uri_fields[8]
@@ -19,7 +20,7 @@ BEGIN {
     total_bytes = post_uri_fields[5]
 
     if (bytes_sent ~ BYTES_SENT_REGEX && total_bytes ~ BYTES_SENT_REGEX && (bytes_sent + 0) < (total_bytes + 0)) {
-        print "Bytes sent was less than the total bytes (object size) yet status was 200 - line #" NR " of " FILENAME > "/dev/stderr"
+        print "Bytes sent was less than the total bytes (object size) yet status was 200 - line #" FNR " of " FILENAME > "/dev/stderr"
         print "Bytes sent: " bytes_sent > "/dev/stderr"
         print "Total bytes (object size): " total_bytes > "/dev/stderr"
         print $0 > "/dev/stderr"
@@ -1,59 +1,27 @@
-import hashlib
 import os
-import pathlib
-import subprocess
 
-from ._base_validator import BaseValidator
+from ._base_awk_pre_validator import BaseAwkPreValidator
 
 
-class ExtractionHeuristicPreValidator(BaseValidator):
+class ExtractionHeuristicPreValidator(BaseAwkPreValidator):
     """
     This is an independent pre-check that ensures our fast extraction heuristic does not miss unintended lines.
 
     This validator is:
-      - not parallelized, but could be
+      - parallelized
       - interruptible
       - updatable
     """
 
     tqdm_description = "Pre-validating extraction heuristic"
 
-    def __hash__(self) -> int:
-        with self._relative_awk_script_path.open("rb") as file_stream:
-            byte_content = file_stream.read()
+    awk_script_file_name = "_extraction_heuristic_pre_validator_script.awk"
+    check_name = "Extraction heuristic"
 
-        checksum = hashlib.sha1(string=byte_content).hexdigest()
-        checksum_int = int(checksum, 16)
-        return checksum_int
-
-    # TODO: parallelize
-    def __init__(self):
+    def __init__(self) -> None:
         self._excluded_ip_regex = os.environ.get("S3_LOG_EXTRACTION_EXCLUDED_IP_REGEX") or "^$"
 
-        # TODO: does this hold after bundling?
-        self._relative_awk_script_path = (
-            pathlib.Path(__file__).parent / "_extraction_heuristic_pre_validator_script.awk"
-        )
-
         super().__init__()
 
-    def _run_validation(self, file_path: pathlib.Path) -> None:
-        absolute_awk_script_path = str(self._relative_awk_script_path.absolute())
-        absolute_file_path = str(file_path.absolute())
-
-        awk_command = f"awk --file {absolute_awk_script_path} {absolute_file_path}"
-        result = subprocess.run(
-            args=awk_command,
-            shell=True,
-            capture_output=True,
-            text=True,
-            env={"EXCLUDED_IP_REGEX": self._excluded_ip_regex},
-        )
-        if result.returncode != 0:
-            message = (
-                f"\nExtraction heuristic pre-check failed.\n "
-                f"Log file: {absolute_file_path}\n"
-                f"Error code {result.returncode}\n\n"
-                f"stderr: {result.stderr}\n"
-            )
-            raise RuntimeError(message)
+    def _get_awk_environment_variables(self) -> dict[str, str]:
+        return {"EXCLUDED_IP_REGEX": self._excluded_ip_regex}
@@ -34,7 +34,7 @@ class RemoteS3BucketValidator:
             return
 
         with self.record_file_path.open(mode="r") as file_stream:
-            self.record = {line.strip() for line in file_stream.readlines() if line.strip()}
+            self.record = {stripped for line in file_stream if (stripped := line.strip())}
 
     def validate_s3_bucket(
         self,
@@ -16,6 +16,9 @@ BEGIN {
 }
 
 {
+    # A cheap substring test discards most non-GET (and empty) lines before any fields are split
+    if (!index($0, "REST.GET.OBJECT")) {next}
+
     split($1, pre_uri_fields, " ")
     request_type = pre_uri_fields[8]
     if (request_type != "REST.GET.OBJECT") {next}
@@ -34,7 +37,7 @@ BEGIN {
         substr(datetime, 20, 2)
 
     if (length(parsed_timestamp) != 12) {
-        print "Error: Failed to parse timestamp " datetime " - line #" NR " of " FILENAME > "/dev/stderr"
+        print "Error: Failed to parse timestamp " datetime " - line #" FNR " of " FILENAME > "/dev/stderr"
         print $0 > "/dev/stderr"
         exit 1
     }
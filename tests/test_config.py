@@ -0,0 +1,96 @@
+"""Tests for reading and saving the configuration file."""
+
+import json
+import pathlib
+import unittest.mock
+
+import pytest
+
+import s3_log_extraction
+
+
+@pytest.fixture
+def config_file_path(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> pathlib.Path:
+    """Point the configuration at a temporary file."""
+    config_file_path = tmp_path / "config.yaml"
+    monkeypatch.setattr("s3_log_extraction.config._config.S3_LOG_EXTRACTION_CONFIG_FILE_PATH", config_file_path)
+    return config_file_path
+
+
+@pytest.mark.ai_generated
+def test_get_config_returns_independent_copies(config_file_path: pathlib.Path) -> None:
+    config = s3_log_extraction.config.get_config()
+    assert config == {}
+    assert config_file_path.exists()
+
+    config["cache_directory"] = "mutated"
+    assert s3_log_extraction.config.get_config() == {}
+
+
+@pytest.mark.ai_generated
+def test_get_config_follows_changes_to_the_file(config_file_path: pathlib.Path, tmp_path: pathlib.Path) -> None:
+    assert s3_log_extraction.config.get_config() == {}
+
+    # Anything written through `save_config` is picked up...
+    expected_config = {"cache_directory": str(tmp_path / "cache")}
+    s3_log_extraction.config.save_config(config=expected_config)
+    assert s3_log_extraction.config.get_config() == expected_config
+
+    # ...and so are edits made to the file by other means, such as another process
+    external_config = {"cache_directory": "external"}
+    config_file_path.write_text(json.dumps(external_config))
+    assert s3_log_extraction.config.get_config() == external_config
+
+
+@pytest.mark.ai_generated
+def test_get_config_only_parses_the_file_again_once_it_changes(config_file_path: pathlib.Path) -> None:
+    with unittest.mock.patch("json.load", wraps=json.load) as mock_load:
+        s3_log_extraction.config.get_config()
+        s3_log_extraction.config.get_config()
+        assert mock_load.call_count == 1
+
+        s3_log_extraction.config.save_config(config={"cache_directory": "saved"})
+        assert s3_log_extraction.config.get_config() == {"cache_directory": "saved"}
+        s3_log_extraction.config.get_config()
+        assert mock_load.call_count == 2
+
+        config_file_path.write_text(json.dumps({"cache_directory": "edited on disk"}))
+        assert s3_log_extraction.config.get_config() == {"cache_directory": "edited on disk"}
+        s3_log_extraction.config.get_config()
+        assert mock_load.call_count == 3
+
+
+@pytest.mark.ai_generated
+def test_save_config_skips_only_empty_configurations(config_file_path: pathlib.Path) -> None:
+    s3_log_extraction.config.save_config(config={})
+    assert config_file_path.exists() is False
+
+    # A falsy key still makes for a non-empty configuration
+    s3_log_extraction.config.save_config(config={"": "value"})
+    assert json.loads(config_file_path.read_text()) == {"": "value"}
+
+
+@pytest.mark.ai_generated
+def test_save_config_replaces_the_file_without_leaving_temporary_files(
+    config_file_path: pathlib.Path, tmp_path: pathlib.Path
+) -> None:
+    s3_log_extraction.config.get_config()
+    original_inode = config_file_path.stat().st_ino
+
+    s3_log_extraction.config.save_config(config={"cache_directory": "replaced"})
+
+    # A fresh file is swapped in rather than the existing one being truncated and rewritten while others may read it
+    assert (config_file_path.stat().st_ino != original_inode) is True
+    assert json.loads(config_file_path.read_text()) == {"cache_directory": "replaced"}
+    assert [path.name for path in tmp_path.iterdir()] == ["config.yaml"]
+
+
+@pytest.mark.ai_generated
+def test_set_cache_directory_updates_get_cache_directory(
+    config_file_path: pathlib.Path, tmp_path: pathlib.Path
+) -> None:
+    cache_directory = tmp_path / "cache"
+    s3_log_extraction.config.set_cache_directory(directory=cache_directory)
+
+    assert s3_log_extraction.config.get_cache_directory() == cache_directory
+    assert json.loads(config_file_path.read_text()) == {"cache_directory": str(cache_directory)}
@@ -1,6 +1,7 @@
 """Tests for the DownloadsLogicPreValidator."""
 
 import pathlib
+import subprocess
 
 import pytest
 
@@ -34,6 +35,27 @@ def _make_log_line(status: str, bytes_sent: str, total_bytes: str) -> str:
     return f'{_LOG_PREFIX}"GET /test/file.dat HTTP/1.1" {status} - {bytes_sent} {total_bytes}{_LOG_SUFFIX}\n'
 
 
+@pytest.fixture
+def validator(tmp_path: pathlib.Path) -> DownloadsLogicPreValidator:
+    """A validator whose record starts empty and is kept out of the shared cache directory."""
+    validator = DownloadsLogicPreValidator()
+    validator.record_file_path = tmp_path / "record.txt"
+    validator.record = set()
+    return validator
+
+
+@pytest.fixture
+def sorted_walk_order(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Validate the files of a directory in name order instead of a random one.
+
+    The tests that rely on this also assume that `validate_directory` splits the ordered files into contiguous batches,
+    one per worker, as long as there are only a few files. Four files then make a single batch when validated serially
+    and the two batches [0, 1] and [2, 3] across two workers.
+    """
+    monkeypatch.setattr("random.shuffle", list.sort)
+
+
 @pytest.mark.ai_generated
 def test_downloads_logic_valid_complete_download(tmp_path: pathlib.Path) -> None:
     """Validator should pass when bytes_sent equals total_bytes with a 200 status."""
@@ -87,3 +109,100 @@ def test_downloads_logic_aberrant_bytes_less_than_total(tmp_path: pathlib.Path)
     validator = DownloadsLogicPreValidator()
     with pytest.raises(RuntimeError, match="Downloads logic pre-check failed"):
         validator._run_validation(file_path=log_file)
+
+
+@pytest.mark.ai_generated
+@pytest.mark.parametrize("workers", [1, 2])
+def test_downloads_logic_validate_directory(
+    tmp_path: pathlib.Path, validator: DownloadsLogicPreValidator, workers: int
+) -> None:
+    """Every valid file in a directory is recorded, whether validated serially or in parallel."""
+    log_directory = tmp_path / "logs"
+    log_directory.mkdir()
+    for index in range(4):
+        log_file = log_directory / f"{index}.log"
+        log_file.write_text(_make_log_line(status="200", bytes_sent="1000", total_bytes="1000"))
+
+    validator.validate_directory(directory=log_directory, workers=workers)
+
+    expected_record = {str(file_path.absolute()) for file_path in log_directory.iterdir()}
+    assert validator.record == expected_record
+    assert set(validator.record_file_path.read_text().splitlines()) == expected_record
+
+
+@pytest.mark.ai_generated
+@pytest.mark.parametrize("workers", [1, 2])
+def test_downloads_logic_validate_directory_aberrant(
+    tmp_path: pathlib.Path, validator: DownloadsLogicPreValidator, workers: int
+) -> None:
+    """A violation in any file of the directory is raised and that file is never recorded."""
+    log_directory = tmp_path / "logs"
+    log_directory.mkdir()
+    (log_directory / "valid.log").write_text(_make_log_line(status="200", bytes_sent="1000", total_bytes="1000"))
+    aberrant_log_file = log_directory / "aberrant.log"
+    aberrant_log_file.write_text(_make_log_line(status="200", bytes_sent="100", total_bytes="1000"))
+
+    with pytest.raises(RuntimeError, match="Downloads logic pre-check failed") as error_info:
+        validator.validate_directory(directory=log_directory, workers=workers)
+
+    # Both files are checked in one batch, yet the error still names the offending log
+    assert f"Log file: {aberrant_log_file.absolute()}\n" in str(error_info.value)
+    assert str(aberrant_log_file.absolute()) not in validator.record
+
+
+@pytest.mark.ai_generated
+@pytest.mark.usefixtures("sorted_walk_order")
+@pytest.mark.parametrize(
+    ("workers", "aberrant_index", "expected_recorded_indices"),
+    [
+        pytest.param(1, 2, {0, 1}, id="serial"),
+        pytest.param(2, 3, {2}, id="parallel"),
+    ],
+)
+def test_downloads_logic_validate_directory_records_files_before_violation(
+    tmp_path: pathlib.Path,
+    validator: DownloadsLogicPreValidator,
+    workers: int,
+    aberrant_index: int,
+    expected_recorded_indices: set[int],
+) -> None:
+    """A violation is raised, while the files that passed before it in its batch are still recorded."""
+    log_directory = tmp_path / "logs"
+    log_directory.mkdir()
+    for index in range(4):
+        bytes_sent = "100" if index == aberrant_index else "1000"
+        (log_directory / f"{index}.log").write_text(
+            _make_log_line(status="200", bytes_sent=bytes_sent, total_bytes="1000")
+        )
+
+    with pytest.raises(RuntimeError, match="Downloads logic pre-check failed"):
+        validator.validate_directory(directory=log_directory, workers=workers)
+
+    file_paths = [str((log_directory / f"{index}.log").absolute()) for index in range(4)]
+    expected_recorded_file_paths = {file_paths[index] for index in expected_recorded_indices}
+    # Batches other than the failing one may or may not have finished by the time the violation is raised
+    assert expected_recorded_file_paths <= validator.record
+    assert validator.record <= set(file_paths[:aberrant_index])
+    assert set(validator.record_file_path.read_text().splitlines()) == validator.record
+
+
+@pytest.mark.ai_generated
+def test_downloads_logic_skips_empty_files_without_running_awk(
+    tmp_path: pathlib.Path, validator: DownloadsLogicPreValidator, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Empty logs are recorded as valid without spawning AWK, while missing logs fail immediately."""
+    log_directory = tmp_path / "logs"
+    log_directory.mkdir()
+    for index in range(3):
+        (log_directory / f"{index}.log").write_bytes(b"")
+
+    def _run_stub(**kwargs) -> subprocess.CompletedProcess:
+        raise AssertionError("AWK should not be run on empty log files.")
+
+    monkeypatch.setattr("subprocess.run", _run_stub)
+
+    validator.validate_directory(directory=log_directory, workers=1)
+
+    assert validator.record == {str(file_path.absolute()) for file_path in log_directory.iterdir()}
+    with pytest.raises(FileNotFoundError):
+        validator._run_validation(file_path=tmp_path / "missing.log")
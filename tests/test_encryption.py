@@ -86,6 +86,22 @@ def test_get_key_salt_override_changes_key(monkeypatch: pytest.MonkeyPatch) -> N
     assert (s3_log_extraction.utils.get_key() != default_salt_key) is True
 
 
+@pytest.mark.ai_generated
+def test_get_key_follows_password_changes(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Keys are reused for a repeated password but never for a different one."""
+    monkeypatch.delenv("S3_LOG_EXTRACTION_SALT", raising=False)
+
+    monkeypatch.setenv("S3_LOG_EXTRACTION_PASSWORD", _STRONG_PASSWORD)
+    first_key = s3_log_extraction.utils.get_key()
+    assert (s3_log_extraction.utils.get_key() == first_key) is True
+
+    monkeypatch.setenv("S3_LOG_EXTRACTION_PASSWORD", secrets.token_urlsafe(32))
+    assert (s3_log_extraction.utils.get_key() != first_key) is True
+
+    monkeypatch.setenv("S3_LOG_EXTRACTION_PASSWORD", _STRONG_PASSWORD)
+    assert (s3_log_extraction.utils.get_key() == first_key) is True
+
+
 @pytest.mark.ai_generated
 @pytest.mark.parametrize("data", [b"192.0.2.1\n198.51.100.2\n", b""])
 def test_encrypt_decrypt_round_trip(data: bytes, monkeypatch: pytest.MonkeyPatch) -> None:
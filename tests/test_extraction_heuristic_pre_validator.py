@@ -1,5 +1,6 @@
 """Tests for the ExtractionHeuristicPreValidator."""
 
+import os
 import pathlib
 import subprocess
 
@@ -45,20 +46,21 @@ def test_run_validation_passes_excluded_ip_regex_env(monkeypatch: pytest.MonkeyP
     captured_env: dict[str, str] = {}
 
     def _run_stub(
-        *, args: str, shell: bool, capture_output: bool, text: bool, env: dict[str, str]
+        *, args: list[str], shell: bool, capture_output: bool, env: dict[str, str]
     ) -> subprocess.CompletedProcess:
-        assert args.startswith("awk --file ")
-        assert shell is True
+        assert args[:2] == ["awk", "--file"]
+        assert args[-1] == str(log_path.absolute())
+        assert shell is False
         assert capture_output is True
-        assert text is True
         captured_env.update(env)
-        return subprocess.CompletedProcess(args=args, returncode=0, stdout="", stderr="")
+        return subprocess.CompletedProcess(args=args, returncode=0, stdout=b"", stderr=b"")
 
     monkeypatch.setattr("subprocess.run", _run_stub)
 
     log_path = tmp_path / "test.log"
-    log_path.write_text("")
+    log_path.write_text("placeholder log line\n")  # Empty logs are skipped without running AWK
 
     validator = ExtractionHeuristicPreValidator()
     validator._run_validation(file_path=log_path)
-    assert captured_env == {"EXCLUDED_IP_REGEX": expected_regex}
+    assert captured_env["EXCLUDED_IP_REGEX"] == expected_regex
+    assert captured_env["PATH"] == os.environ["PATH"]
@@ -1,6 +1,8 @@
 import pathlib
+import secrets
 
 import py
+import pytest
 
 import s3_log_extraction
 
@@ -67,4 +69,81 @@ def test_extraction_parallel(tmpdir: py.path.local) -> None:
     )
 
 
+@pytest.mark.ai_generated
+def test_extraction_cache_directory_with_spaces(tmp_path: pathlib.Path) -> None:
+    """Extraction succeeds and completes its records when the cache directory path contains spaces."""
+    base_directory = pathlib.Path(__file__).parent
+    test_logs_directory = base_directory / "example_logs"
+    output_directory = tmp_path / "test extraction with spaces"
+    output_directory.mkdir()
+    expected_output_directory = base_directory / "expected_output"
+
+    extractor = s3_log_extraction.extractors.S3LogAccessExtractor(
+        cache_directory=output_directory, use_encryption=False
+    )
+    extractor.extract_directory(directory=test_logs_directory, workers=1)
+
+    relative_output_files = {
+        file.relative_to(output_directory / "extraction") for file in (output_directory / "extraction").rglob("*.txt")
+    }
+    relative_expected_files = {
+        file.relative_to(expected_output_directory / "extraction")
+        for file in (expected_output_directory / "extraction").rglob("*.txt")
+    }
+    assert relative_output_files == relative_expected_files
+
+
+@pytest.mark.ai_generated
+@pytest.mark.parametrize("workers", [1, 2])
+def test_extraction_with_encryption(tmp_path: pathlib.Path, workers: int, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Merged IP files are encrypted on disk yet decrypt to exactly the plaintext extraction result."""
+    monkeypatch.setenv("S3_LOG_EXTRACTION_PASSWORD", secrets.token_urlsafe(32))
+    base_directory = pathlib.Path(__file__).parent
+    test_logs_directory = base_directory / "example_logs"
+    output_directory = tmp_path / "test_extraction"
+    output_directory.mkdir()
+    expected_extraction_directory = base_directory / "expected_output" / "extraction"
+
+    extractor = s3_log_extraction.extractors.S3LogAccessExtractor(cache_directory=output_directory, use_encryption=True)
+    extractor.extract_directory(directory=test_logs_directory, workers=workers)
+
+    extraction_directory = output_directory / "extraction"
+    relative_output_files = {file.relative_to(extraction_directory) for file in extraction_directory.rglob("*.txt")}
+    relative_expected_files = {
+        file.relative_to(expected_extraction_directory) for file in expected_extraction_directory.rglob("*.txt")
+    }
+    assert relative_output_files == relative_expected_files
+
+    for relative_file in relative_expected_files:
+        if relative_file.name != "ips.txt":
+            continue
+
+        expected_text = (expected_extraction_directory / relative_file).read_text().replace("\r\n", "\n")
+        output_file_path = extraction_directory / relative_file
+        assert output_file_path.read_bytes() != expected_text.encode(encoding="utf-8")
+        assert (
+            s3_log_extraction.utils.read_text_from_file(file_path=output_file_path, use_encryption=True)
+            == expected_text
+        )
+
+
 # TODO: CLI
+
+
+@pytest.mark.ai_generated
+def test_extractor_detects_interrupted_extraction(tmp_path: pathlib.Path) -> None:
+    records_directory = tmp_path / "records"
+    records_directory.mkdir()
+    start_record_file_path = records_directory / "S3LogAccessExtractor_file-processing-start.txt"
+    end_record_file_path = records_directory / "S3LogAccessExtractor_file-processing-end.txt"
+    start_record_file_path.write_text("2020/01/01/a.log\n2020/01/02/b.log\n")
+    end_record_file_path.write_text("2020/01/01/a.log\n2020/01/02/b.log\n")
+
+    extractor = s3_log_extraction.extractors.S3LogAccessExtractor(cache_directory=tmp_path, use_encryption=False)
+    assert extractor.file_processing_end_record == {"2020/01/01/a.log", "2020/01/02/b.log"}
+
+    # A log that was started but never finished means its extraction may be partially written
+    with start_record_file_path.open(mode="a") as file_stream:
+        file_stream.write("2020/01/03/c.log\n")
+    with pytest.raises(ValueError, match="Record corruption from previous run detected"):
+        s3_log_extraction.extractors.S3LogAccessExtractor(cache_directory=tmp_path, use_encryption=False)
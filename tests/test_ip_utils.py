@@ -1,3 +1,4 @@
+import collections.abc
 import datetime
 import pathlib
 import shutil
@@ -11,6 +12,18 @@ import yaml
 import s3_log_extraction
 
 
+@pytest.fixture(autouse=True)
+def clear_cidr_caches() -> collections.abc.Iterator[None]:
+    """Start and end every test with empty CIDR caches, so that no test sees the ranges fetched or faked by another."""
+    ip_utils_module = s3_log_extraction.ip_utils._ip_utils
+    cached_functions = (ip_utils_module._get_cidr_address_ranges_and_subregions, ip_utils_module._get_cidr_lookup)
+    for cached_function in cached_functions:
+        cached_function.cache_clear()
+    yield
+    for cached_function in cached_functions:
+        cached_function.cache_clear()
+
+
 def test_ip_utils(tmpdir: py.path.local, monkeypatch: pytest.MonkeyPatch) -> None:
     test_cache = pathlib.Path(tmpdir)
     test_ips_dir = test_cache / "ips"
@@ -183,3 +196,130 @@ def test_update_ip_to_region_codes_handles_ipinfo_quota_exceeded(
     ip_to_region_file = tmp_path / "ips" / "ip_to_region.yaml"
     ip_to_region = yaml.safe_load(ip_to_region_file.read_text()) or {}
     assert ip_to_region[test_ip] == "undetermined"
+
+
+@pytest.mark.ai_generated
+def test_update_region_code_coordinates_skips_unresolved_regions(
+    tmp_path: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """IPs cached with a null region are skipped instead of being sent to the geocoding services."""
+    test_ips_dir = tmp_path / "ips"
+    test_ips_dir.mkdir(parents=True)
+    (test_ips_dir / "ip_to_region.yaml").write_text(yaml.dump({"192.0.2.1": None, "192.0.2.2": "bogon"}))
+
+    monkeypatch.setenv("IPINFO_API_KEY", "test-key-non-remote")
+    monkeypatch.setenv("OPENCAGE_API_KEY", "test-key-non-remote")
+
+    with unittest.mock.patch("opencage.geocoder.OpenCageGeocode") as mock_opencage:
+        s3_log_extraction.ip_utils.update_region_code_coordinates(cache_directory=tmp_path, use_encryption=False)
+
+    assert mock_opencage.return_value.geocode.called is False
+    region_codes_to_coordinates = yaml.safe_load((test_ips_dir / "region_codes_to_coordinates.yaml").read_text())
+    assert region_codes_to_coordinates["bogon"] == {"latitude": None, "longitude": None}
+
+
+@pytest.mark.ai_generated
+def test_update_region_code_coordinates_with_several_workers(
+    tmp_path: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture,
+) -> None:
+    """Lookups spread over several threads still resolve every region and report each failure once."""
+    region_codes = [f"US/Region{index}" for index in range(20)]
+    ip_to_region = {f"192.0.2.{index}": region_code for index, region_code in enumerate(region_codes)}
+    test_ips_dir = tmp_path / "ips"
+    test_ips_dir.mkdir(parents=True)
+    (test_ips_dir / "ip_to_region.yaml").write_text(yaml.dump(ip_to_region))
+
+    monkeypatch.setenv("IPINFO_API_KEY", "test-key-non-remote")
+    monkeypatch.setenv("OPENCAGE_API_KEY", "test-key-non-remote")
+
+    def _geocode_stub(query: str) -> list[dict]:
+        index = int(query.removeprefix("US/Region"))
+        if index % 5 == 0:
+            return []
+        return [{"geometry": {"lat": float(index), "lng": -float(index)}}]
+
+    with unittest.mock.patch("opencage.geocoder.OpenCageGeocode") as mock_opencage:
+        mock_opencage.return_value.geocode.side_effect = _geocode_stub
+        s3_log_extraction.ip_utils.update_region_code_coordinates(
+            cache_directory=tmp_path, use_encryption=False, workers=4
+        )
+
+    region_codes_to_coordinates = yaml.safe_load((test_ips_dir / "region_codes_to_coordinates.yaml").read_text())
+    for index, region_code in enumerate(region_codes):
+        if index % 5 == 0:
+            assert region_code not in region_codes_to_coordinates
+        else:
+            assert region_codes_to_coordinates[region_code] == {"latitude": float(index), "longitude": -float(index)}
+
+    printed_failures = capsys.readouterr().out.split("OpenCage API:\n")[1].strip().split(", ")
+    assert sorted(printed_failures) == sorted(region_codes[index] for index in range(0, 20, 5))
+
+
+@pytest.mark.ai_generated
+def test_update_ip_to_region_codes_matches_service_cidr_ranges(
+    tmp_path: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """IPs inside a known service range resolve to the first listed matching range without querying IPInfo."""
+    fake_cidr_responses = {
+        "GitHub": {"hooks": ["192.0.2.0/24"], "domains": {}},
+        "AWS": {
+            "prefixes": [
+                {"ip_prefix": "198.51.100.0/24", "region": "GLOBAL"},
+                {"ip_prefix": "198.51.100.128/25", "region": "us-east-2"},
+                {"ip_prefix": "203.0.113.64/26", "region": "us-west-1"},
+                {"ip_prefix": "not-a-cidr", "region": "us-west-2"},
+            ]
+        },
+        "GCP": {"prefixes": [{"ipv4Prefix": "203.0.113.0/24", "scope": "us-central1"}]},
+        "VPN": ["100.64.0.0/10"],
+    }
+    expected_ip_to_region = {
+        "192.0.2.7": "GitHub",
+        "198.51.100.200": "AWS/GLOBAL",  # Also inside the nested us-east-2 range, which is listed later
+        "203.0.113.70": "AWS/us-west-1",  # Also inside the GCP range, but AWS is checked first
+        "203.0.113.5": "GCP/us-central1",
+        "100.64.1.1": "VPN",
+    }
+
+    extraction_dir = tmp_path / "extraction" / "test_dataset" / "test_asset"
+    extraction_dir.mkdir(parents=True)
+    (extraction_dir / "ips.txt").write_text("\n".join(expected_ip_to_region) + "\n")
+
+    monkeypatch.setenv("IPINFO_API_KEY", "test-key-non-remote")
+    monkeypatch.setattr(
+        "s3_log_extraction.ip_utils._ip_utils._request_cidr_range",
+        lambda service_name: fake_cidr_responses[service_name],
+    )
+
+    mock_handler = unittest.mock.MagicMock()
+    with unittest.mock.patch("ipinfo.getHandler", return_value=mock_handler):
+        with pytest.warns(UserWarning, match="Skipping invalid CIDR entry 'not-a-cidr'"):
+            s3_log_extraction.ip_utils.update_ip_to_region_codes(cache_directory=tmp_path, use_encryption=False)
+
+    assert mock_handler.getDetails.called is False
+    ip_to_region = yaml.safe_load((tmp_path / "ips" / "ip_to_region.yaml").read_text())
+    assert ip_to_region == expected_ip_to_region
+
+
+@pytest.mark.ai_generated
+def test_write_ip_cache_removes_temporary_file_when_replace_fails(
+    tmp_path: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A write that fails before the temporary file is moved into place leaves nothing behind in the cache."""
+
+    def _replace_stub(*, src: pathlib.Path, dst: pathlib.Path) -> None:
+        raise OSError("No space left on device")
+
+    monkeypatch.setattr("os.replace", _replace_stub)
+
+    with pytest.raises(OSError, match="No space left on device"):
+        s3_log_extraction.ip_utils.write_ip_cache(
+            data={"192.0.2.1": "bogon"}, cache_type="ip_to_region", cache_directory=tmp_path, use_encryption=False
+        )
+
+    assert list((tmp_path / "ips").iterdir()) == []
@@ -430,3 +430,31 @@ def test_local_inventory_filename_only_record(
 
     # Only the one file not in the end-record should be returned
     assert result == [f"s3://{source_bucket}/{other_key}"]
+
+
+@pytest.mark.ai_generated
+def test_serial_extraction_discards_prefetched_download_on_stop(tmp_path: pathlib.Path) -> None:
+    """Stopping a serial extraction removes the log fetched ahead along with the temporary directory."""
+    extractor = _make_extractor(tmp_path)
+    s3_urls = [f"s3://bucket/2024-01-0{index}-00-00-00-ABCDEF" for index in range(1, 4)]
+
+    def _download_stub(*, s3_url: str) -> pathlib.Path:
+        temporary_file_path = extractor.temporary_directory / s3_url.split("/")[-1]
+        temporary_file_path.write_text("placeholder log line\n")
+        return temporary_file_path
+
+    def _extract_stub(*, s3_url: str, s3_root: str, temporary_file_path: pathlib.Path) -> None:
+        temporary_file_path.unlink()
+        extractor.stop_file_path.touch()
+
+    with (
+        unittest.mock.patch("s3_log_extraction.extractors._remote_s3_log_access_extractor._handle_aws_credentials"),
+        unittest.mock.patch.object(extractor, "_get_unprocessed_s3_urls", return_value=s3_urls),
+        unittest.mock.patch.object(extractor, "_download_s3_url", side_effect=_download_stub) as mock_download,
+        unittest.mock.patch.object(extractor, "_extract_s3_url", side_effect=_extract_stub) as mock_extract,
+    ):
+        extractor.extract_s3_bucket(s3_root="s3://bucket", workers=1)
+
+    assert mock_extract.call_count == 1
+    assert mock_download.call_count == 2
+    assert extractor.temporary_directory.exists() is False